@@ -39,6 +39,7 @@ from app.services.container import (
 )
 from app.utils.logger import get_logger
 from app.utils.auth_dependencies import get_current_admin
+from app.utils.exceptions import AgentError
 from app.db.supabase import get_supabase
 from app.utils.datetime_utils import (
     IST,
@@ -114,10 +115,24 @@ async def enroll_manager(
             email=request.email,
         )
         return ManagerResponse(**result)
+    except AgentError as e:
+        if "already exists" not in e.message:
+            # register_manager also wraps database/connection failures in AgentError
+            logger.error(f"[API] Error enrolling manager: {str(e)}", exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
+            )
+        # Expected rejection (email already registered): no traceback needed
+        logger.warning(f"[API] Manager enrollment rejected: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"[API] Error enrolling manager: {str(e)}", exc_info=True)
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
@@ -766,6 +781,9 @@ async def _process_bulk_schedule_data(http_request: Request, candidates: List[di
     
     # Give background tasks a moment to start
     await asyncio.sleep(0.1)
+
+    # Same for every row of this request: resolve once, not per candidate
+    base_url = get_frontend_url(http_request)
     
     for idx, item in enumerate(candidates):
         row_num = idx + 1
@@ -777,7 +795,8 @@ async def _process_bulk_schedule_data(http_request: Request, candidates: List[di
                 raise ValueError("email and datetime are required")
             
             # Get user
-            user = user_service.get_user_by_email(email)
+            # Fresh read: a user deleted on another worker must not get a new interview
+            user = user_service.get_user_by_email(email, use_cache=False)
             if not user:
                 raise ValueError(f"User with email {email} not found")
             
@@ -816,7 +835,6 @@ async def _process_bulk_schedule_data(http_request: Request, candidates: List[di
             )
             
             # Generate interview URL
-            base_url = get_frontend_url(http_request)
             interview_url = f"{base_url}/interview/{token}" if base_url else f"/interview/{token}"
             
             # Helper for background email
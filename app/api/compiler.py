@@ -17,6 +17,28 @@ config = get_config()
 
 router = APIRouter(tags=["Compiler"])
 
+# One pooled client for all OneCompiler calls, so requests reuse keep-alive connections
+# instead of paying a TCP + TLS handshake each. Created on first use inside the app's loop.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the pooled OneCompiler client (called on app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class CodeExecutionRequest(BaseModel):
     language: str
@@ -83,42 +105,42 @@ async def execute_code(request: CodeExecutionRequest):
         logger.info(f"[Compiler] Executing {compiler_language} code ({len(request.code)} chars)")
         
         # Make request to OneCompiler API
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                compiler_api_url,
-                json=payload,
-                headers={
-                    "X-API-Key": compiler_access_token,
-                    "Content-Type": "application/json"
-                }
-            )
-            
-            if response.status_code != 200:
-                error_text = response.text
-                logger.error(f"[Compiler] OneCompiler API error: {response.status_code} - {error_text}")
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail=f"Compiler service error: {error_text[:200]}"
-                )
-            
-            result = response.json()
-            
-            # Extract results from OneCompiler response (use or "" so None from API becomes empty string)
-            stdout = result.get("stdout") or ""
-            stderr = result.get("stderr") or ""
-            execution_time = result.get("executionTime")
-            memory = result.get("memory")
-            
-            logger.info(f"[Compiler] Execution completed: {len(stdout)} chars output, {execution_time}ms")
-            
-            return CodeExecutionResponse(
-                stdout=stdout,
-                stderr=stderr,
-                executionTime=execution_time,
-                memory=memory,
-                error=stderr if stderr else None
+        client = _get_http_client()
+        response = await client.post(
+            compiler_api_url,
+            json=payload,
+            headers={
+                "X-API-Key": compiler_access_token,
+                "Content-Type": "application/json"
+            }
+        )
+        
+        if response.status_code != 200:
+            error_text = response.text
+            logger.error(f"[Compiler] OneCompiler API error: {response.status_code} - {error_text}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Compiler service error: {error_text[:200]}"
             )
-            
+        
+        result = response.json()
+        
+        # Extract results from OneCompiler response (use or "" so None from API becomes empty string)
+        stdout = result.get("stdout") or ""
+        stderr = result.get("stderr") or ""
+        execution_time = result.get("executionTime")
+        memory = result.get("memory")
+        
+        logger.info(f"[Compiler] Execution completed: {len(stdout)} chars output, {execution_time}ms")
+        
+        return CodeExecutionResponse(
+            stdout=stdout,
+            stderr=stderr,
+            executionTime=execution_time,
+            memory=memory,
+            error=stderr if stderr else None
+        )
+        
     except httpx.TimeoutException:
         logger.error("[Compiler] Request timeout")
         raise HTTPException(
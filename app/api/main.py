@@ -26,7 +26,7 @@ from slowapi.errors import RateLimitExceeded
 
 from app.config import Config, get_config
 from app.db.supabase import get_supabase
-from app.services.evaluation_service import EvaluationService
+from app.services.evaluation_service import EvaluationService, shutdown_analysis_executor
 from app.schemas.admin import (
     JobDescriptionRequest,
     JobDescriptionResponse,
@@ -152,7 +152,7 @@ from app.api.slots import router as slots_router
 from app.api.users import router as users_router
 from app.api.resume import router as resume_router
 from app.api.student import router as student_router
-from app.api.compiler import router as compiler_router
+from app.api.compiler import router as compiler_router, close_http_client
 
 app.include_router(auth_router, prefix="/api/auth", tags=["Auth"])
 app.include_router(admin_router, prefix="/api/admin", tags=["Admin"])
@@ -175,6 +175,13 @@ async def startup_log_db():
         logger.warning(f"[API] Supabase initialization warning: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_executors():
+    """Release the shared worker pools and HTTP clients."""
+    shutdown_analysis_executor()
+    await close_http_client()
+
+
 @app.get("/health", tags=["System"])
 async def health():
     """Liveness probe: returns 200 if the process is running."""
@@ -309,6 +316,8 @@ if __name__ == "__main__":
         "app.api.main:app",
         host=config.server.host,
         port=config.server.port,
-        reload=True,
+        # uvicorn[standard] ships uvloop + httptools; the "auto" loop/http settings pick them up
+        reload=config.server.reload,
+        workers=None if config.server.reload else config.server.workers,
     )
 
@@ -1,3 +1,6 @@
+import asyncio
+from typing import Tuple
+
 from fastapi import APIRouter, HTTPException, UploadFile, File, status
 
 from app.schemas.resume import UploadApplicationResponse
@@ -12,6 +15,38 @@ logger = get_logger(__name__)
 # Resume / application upload endpoints
 router = APIRouter(tags=["Resume"])
 
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_upload_capped(file: UploadFile, max_size: int) -> Tuple[bytes, str]:
+    """
+    Read an upload in chunks, aborting as soon as it exceeds max_size.
+
+    Starlette already spools the body to a temp file; reading it in chunks
+    means an oversized upload is rejected after max_size bytes instead of
+    being copied into memory in full first. The content digest is updated
+    chunk by chunk along the way, so extraction does not re-hash the bytes.
+
+    Returns:
+        Tuple of (content, content_digest)
+    """
+    chunks = []
+    total = 0
+    hasher = resume_service.content_hasher()
+    while True:
+        chunk = await file.read(_UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File size exceeds maximum of {max_size / 1024 / 1024}MB"
+            )
+        hasher.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), hasher.hexdigest()
+
 
 @router.post("/upload-application", response_model=UploadApplicationResponse)
 async def upload_application(file: UploadFile = File(...)):
@@ -30,8 +65,16 @@ async def upload_application(file: UploadFile = File(...)):
 
         logger.info(f"[API] Received application upload: {file.filename} ({file.content_type})")
 
-        # Read file content
-        file_content = await file.read()
+        # Reject unsupported types from the headers alone, before reading the body
+        is_valid, error_msg = resume_service.validate_file_type(file.filename, file.content_type)
+        if not is_valid:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=error_msg
+            )
+
+        # Read file content (bounded by the service's size limit)
+        file_content, content_digest = await _read_upload_capped(file, resume_service.MAX_FILE_SIZE)
 
         # Check if file is empty
         if not file_content or len(file_content) == 0:
@@ -40,7 +83,7 @@ async def upload_application(file: UploadFile = File(...)):
                 detail="Uploaded file is empty"
             )
 
-        # Validate file
+        # Validate size and file signature before spending upload bandwidth
         is_valid, error_msg = resume_service.validate_file(
             file_content, file.filename, file.content_type
         )
@@ -50,20 +93,28 @@ async def upload_application(file: UploadFile = File(...)):
                 detail=error_msg
             )
 
-        # Upload to storage
-        try:
-            application_url = booking_service.upload_application_to_storage(file_content, file.filename)
-        except Exception as e:
-            logger.error(f"[API] Failed to upload to storage: {str(e)}")
+        # Upload to storage and extract text concurrently: both only need the buffered bytes.
+        # The Supabase storage client and the PDF/DOCX parsers are synchronous, so both run
+        # in the threadpool; extract_text reports failures in its return value instead of raising.
+        application_url, extraction = await asyncio.gather(
+            asyncio.to_thread(
+                booking_service.upload_application_to_storage, file_content, file.filename
+            ),
+            asyncio.to_thread(
+                resume_service.extract_text, file_content, file.filename, file.content_type,
+                content_digest=content_digest,
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(application_url, Exception):
+            logger.error(f"[API] Failed to upload to storage: {str(application_url)}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to upload application: {str(e)}"
+                detail=f"Failed to upload application: {str(application_url)}"
             )
-
-        # Extract text
-        application_text, extraction_error = resume_service.extract_text(
-            file_content, file.filename, file.content_type
-        )
+        if isinstance(extraction, Exception):
+            raise extraction
+        application_text, extraction_error = extraction
 
         if application_text:
             logger.info(f"[API] ✅ Application processed: {len(application_text)} characters extracted")
@@ -80,13 +131,15 @@ async def upload_application(file: UploadFile = File(...)):
         raise
     except Exception as e:
         error_msg = f"Failed to process application: {str(e)}"
-        logger.error(f"[API] {error_msg}", exc_info=True)
         # Return more detailed error for debugging
         if "422" in str(e) or "Unprocessable" in str(e):
+            # Bad upload from the client, not a server fault: skip the traceback
+            logger.warning(f"[API] {error_msg}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid file format or file is corrupted. Please ensure the file is a valid PDF, DOC, or DOCX file."
             )
+        logger.error(f"[API] {error_msg}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=error_msg
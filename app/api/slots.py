@@ -1,7 +1,10 @@
+import asyncio
 from datetime import datetime, timedelta
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
 
 from app.schemas.slots import (
     CreateSlotRequest,
@@ -15,13 +18,27 @@ from app.services.container import (
 )
 from app.utils.logger import get_logger
 from app.utils.auth_dependencies import get_current_admin
-from app.utils.datetime_utils import to_ist
+from app.utils.datetime_utils import parse_iso_to_ist
+from app.utils.exceptions import DuplicateSlotError
 
 logger = get_logger(__name__)
 
-# Slot management (admin + public availability)
+# Slot management (admin + public availability).
+# SlotService uses the synchronous Supabase client, so handlers call it via asyncio.to_thread
+# to keep the event loop free while a query is in flight.
 router = APIRouter(tags=["Slots"])
 
+# Built once; serializes slot lists straight to JSON bytes in pydantic-core
+_SLOT_LIST_ADAPTER = TypeAdapter(List[SlotResponse])
+# Rows fetched per Supabase request when streaming the admin slot listing
+_SLOT_STREAM_PAGE_SIZE = 500
+
+
+def _encode_slot_page(slots: List[dict]) -> bytes:
+    """Encode a page of mapped slot rows as JSON array items, without the brackets."""
+    out = [SlotResponse.model_construct(**slot) for slot in slots]
+    return _SLOT_LIST_ADAPTER.dump_json(out)[1:-1]
+
 
 @router.post("/admin/slots", response_model=SlotResponse)
 async def create_slot(
@@ -34,63 +51,40 @@ async def create_slot(
     try:
         # Parse datetime and ensure it's in IST
         try:
-            # Parse the datetime string (may come with or without timezone)
-            slot_datetime_str = request.slot_datetime.replace('Z', '+00:00')
-            slot_datetime = datetime.fromisoformat(slot_datetime_str)
+            # Parse the datetime string (may come with or without timezone; naive means IST)
+            start_time = parse_iso_to_ist(request.slot_datetime)
 
-            # Convert to IST timezone (or assume already IST if naive)
-            start_time = to_ist(slot_datetime)
-
-            logger.info(f"[API] Slot creation - Input: {request.slot_datetime}, Parsed: {slot_datetime}, IST: {start_time}")
+            logger.info("[API] Slot creation - Input: %s, IST: %s", request.slot_datetime, start_time)
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid datetime format. Use ISO format. Error: {str(e)}"
             )
 
-        # Validate capacity
-        if request.max_capacity < 1:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Max capacity must be at least 1"
-            )
-
-        # Validate duration
-        if request.duration_minutes < 1:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Duration must be at least 1 minute"
-            )
-        if request.duration_minutes > 120:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Duration cannot exceed 120 minutes (2 hours)"
-            )
-
+        # max_capacity / duration_minutes bounds are enforced by CreateSlotRequest
         # Use provided duration (default 30 minutes if not specified)
         duration_minutes = request.duration_minutes or 30
         end_time = start_time + timedelta(minutes=duration_minutes)
 
-        # Avoid duplicate: a slot already exists at this datetime
-        slot_datetime_iso = start_time.isoformat()
-        existing = slot_service.get_slot_by_datetime(slot_datetime_iso)
-        if existing:
+        logger.info("[API] Creating slot with duration: %s minutes (from request: %s)", duration_minutes, request.duration_minutes)
+
+        # Duplicates are rejected by the unique index on slot_datetime (no preflight lookup)
+        try:
+            slot = await asyncio.to_thread(
+                slot_service.create_slot,
+                start_time=start_time,
+                end_time=end_time,
+                max_bookings=request.max_capacity,
+                notes=request.notes,
+                duration_minutes=duration_minutes,
+            )
+        except DuplicateSlotError:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="A slot already exists at this date and time. Edit the existing slot or choose a different time."
             )
 
-        logger.info(f"[API] Creating slot with duration: {duration_minutes} minutes (from request: {request.duration_minutes})")
-
-        slot = slot_service.create_slot(
-            start_time=start_time,
-            end_time=end_time,
-            max_bookings=request.max_capacity,
-            notes=request.notes,
-            duration_minutes=duration_minutes,
-        )
-
-        logger.info(f"[API] Slot created: id={slot.get('id')}, duration_minutes={slot.get('duration_minutes')}, stored_duration={slot.get('duration_minutes')}")
+        logger.info("[API] Slot created: id=%s, duration_minutes=%s", slot.get('id'), slot.get('duration_minutes'))
 
         slot_dict = dict(slot)
         slot_dict.setdefault('updated_at', None)
@@ -117,17 +111,55 @@ async def get_all_slots(
     Get all interview slots.
     """
     try:
-        slots = slot_service.get_all_slots(status=slot_status, include_past=include_past)
-        out: List[SlotResponse] = []
-        for slot in slots:
-            d = dict(slot)
-            d.setdefault("updated_at", None)
-            # Ensure datetime fields are strings for SlotResponse (Supabase/Mongo may return datetime)
-            for key in ("slot_datetime", "start_time", "end_time", "created_at", "updated_at"):
-                if key in d and d[key] is not None and hasattr(d[key], "isoformat"):
-                    d[key] = d[key].isoformat()
-            out.append(SlotResponse(**d))
-        return out
+        # SlotService already returns fresh dicts with every datetime field as an IST
+        # string; rows come straight from our own DB, so they are not re-validated.
+        # Fetch the first page up front so a failing query still returns a proper 500
+        first_page, cursor = await asyncio.to_thread(
+            slot_service.get_slots_page, None, _SLOT_STREAM_PAGE_SIZE,
+            status=slot_status, include_past=include_past,
+        )
+
+        if not include_past:
+            # Upcoming slots are a bounded list: read every page before answering, so a
+            # failure on a later page is still a clean 500 rather than a truncated 200
+            pages = [first_page]
+            while cursor is not None:
+                page, cursor = await asyncio.to_thread(
+                    slot_service.get_slots_page, cursor, _SLOT_STREAM_PAGE_SIZE,
+                    status=slot_status, include_past=include_past,
+                )
+                pages.append(page)
+            return Response(
+                content=b"[" + b",".join(chunk for chunk in map(_encode_slot_page, pages) if chunk) + b"]",
+                media_type="application/json",
+            )
+
+        async def stream_slots():
+            # With include_past the listing can run to thousands of rows: stream it page by
+            # page instead of building the whole list and its JSON in memory.
+            yield b"["
+            page, next_cursor, first = first_page, cursor, True
+            while True:
+                if page:
+                    chunk = _encode_slot_page(page)
+                    yield chunk if first else b"," + chunk
+                    first = False
+                if next_cursor is None:
+                    break
+                try:
+                    page, next_cursor = await asyncio.to_thread(
+                        slot_service.get_slots_page, next_cursor, _SLOT_STREAM_PAGE_SIZE,
+                        status=slot_status, include_past=include_past,
+                    )
+                except Exception as e:
+                    # Headers are already sent: abort the transfer without the closing
+                    # bracket or final chunk, so clients see a failed response instead
+                    # of a short but well-formed list
+                    logger.error(f"[API] Slot listing failed mid-stream: {str(e)}", exc_info=True)
+                    raise
+            yield b"]"
+
+        return StreamingResponse(stream_slots(), media_type="application/json")
     except Exception as e:
         error_msg = f"Failed to fetch slots: {str(e)}"
         logger.error(f"[API] {error_msg}", exc_info=True)
@@ -146,7 +178,7 @@ async def get_slot(
     Get an interview slot by ID.
     """
     try:
-        slot = slot_service.get_slot(slot_id)
+        slot = await asyncio.to_thread(slot_service.get_slot, slot_id)
         if not slot:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -174,32 +206,37 @@ async def update_slot(
     Update an interview slot.
     """
     try:
-        updates: dict = {}
-        if request.slot_datetime is not None:
+        # Only fields the client actually provided (None means "leave unchanged")
+        updates: dict = request.model_dump(exclude_none=True)
+        if not updates:
+            # Nothing to write: return the current slot without a DB update
+            slot = await asyncio.to_thread(slot_service.get_slot, slot_id)
+            if not slot:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Slot not found"
+                )
+            return SlotResponse.model_construct(**slot)
+
+        if 'slot_datetime' in updates:
             try:
                 # Parse and convert to IST
-                slot_datetime_str = request.slot_datetime.replace('Z', '+00:00')
-                slot_datetime = datetime.fromisoformat(slot_datetime_str)
-                updates['slot_datetime'] = to_ist(slot_datetime)
-                updates['start_time'] = to_ist(slot_datetime)
+                slot_datetime = parse_iso_to_ist(updates['slot_datetime'])
+                updates['slot_datetime'] = slot_datetime
+                updates['start_time'] = slot_datetime
             except ValueError as e:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Invalid datetime format. Use ISO format. Error: {str(e)}"
                 )
-        if request.max_capacity is not None:
-            if request.max_capacity < 1:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Max capacity must be at least 1"
-                )
-            updates['max_capacity'] = request.max_capacity
-        if request.status is not None:
-            updates['status'] = request.status
-        if request.notes is not None:
-            updates['notes'] = request.notes
 
-        slot = slot_service.update_slot(slot_id, updates)
+        try:
+            slot = await asyncio.to_thread(slot_service.update_slot, slot_id, updates)
+        except DuplicateSlotError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A slot already exists at this date and time. Edit the existing slot or choose a different time."
+            )
         return SlotResponse(**slot)
 
     except HTTPException:
@@ -222,7 +259,7 @@ async def delete_slot(
     Delete an interview slot.
     """
     try:
-        slot_service.delete_slot(slot_id)
+        await asyncio.to_thread(slot_service.delete_slot, slot_id)
         return {"success": True}
     except HTTPException:
         raise
@@ -241,8 +278,11 @@ async def get_available_slots():
     Get available slots for students (public endpoint, no auth required).
     """
     try:
-        slots = slot_service.get_available_slots()
-        return [SlotResponse(**slot) for slot in slots]
+        slots = await asyncio.to_thread(slot_service.get_available_slots)
+        return Response(
+            content=_SLOT_LIST_ADAPTER.dump_json([SlotResponse.model_construct(**slot) for slot in slots]),
+            media_type="application/json",
+        )
     except Exception as e:
         error_msg = f"Failed to fetch available slots: {str(e)}"
         logger.error(f"[API] {error_msg}", exc_info=True)
@@ -280,13 +320,8 @@ async def create_day_slots(
                 detail="Invalid time format. Expected HH:MM (24-hour)"
             )
 
-        if request.interval_minutes < 5:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Interval must be at least 5 minutes"
-            )
-
-        created_slots, errors = slot_service.create_day_slots(
+        created_slots, errors = await asyncio.to_thread(
+            slot_service.create_day_slots,
             date=selected_date,
             start_hour=start_hour,
             start_minute=start_minute,
@@ -300,7 +335,7 @@ async def create_day_slots(
         return CreateDaySlotsResponse(
             success=len(errors) == 0,
             created_count=len(created_slots),
-            slots=[SlotResponse(**slot) for slot in created_slots],
+            slots=[SlotResponse.model_construct(**slot) for slot in created_slots],
             errors=errors or None,
         )
 
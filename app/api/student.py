@@ -1,7 +1,9 @@
 from datetime import timedelta
 from typing import List, Optional
+import hashlib
 
-from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, UploadFile, File, status
+from fastapi.responses import Response
 
 from app.schemas.student_status import (
     AssignmentResponse,
@@ -33,11 +35,52 @@ logger = get_logger(__name__)
 from app.utils.datetime_utils import get_now_ist, parse_datetime_safe
 from app.utils.url_helper import get_frontend_url
 from app.utils.auth_dependencies import get_current_student
+from app.utils.exceptions import SlotUnavailableError
 
 # Student-facing endpoints
 router = APIRouter(tags=["Student"])
 
 
+def _build_interview_entry(booking: dict, url_key: str, url: str, default_status: Optional[str] = None) -> dict:
+    """Build one my-interview list entry; status is included only when default_status is given."""
+    entry = {
+        'token': booking['token'],
+        'scheduled_at': booking['scheduled_at'],
+        url_key: url,
+        'name': booking.get('name'),
+        'email': booking.get('email'),
+    }
+    if default_status is not None:
+        entry['status'] = booking.get('status', default_status)
+    return {
+        'booking': entry,
+        'slot': booking.get('interview_slots') or None,
+    }
+
+
+def _json_with_etag(http_request: Request, body: bytes) -> Response:
+    """
+    JSON response carrying an ETag of its body; answers 304 with no body when the
+    client's If-None-Match already holds that ETag (frontend polling of unchanged state).
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = http_request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _backfill_booking_user_id(tokens: List[str], user_id: str) -> None:
+    """Attach user_id to email-only bookings (run as a background task after my-interview responds)."""
+    if booking_service.bulk_update_user_id(tokens, user_id):
+        logger.info(f"[API] ✅ Updated {len(tokens)} booking(s) with user_id: {user_id}")
+    else:
+        logger.warning(f"[API] Failed to update bookings {tokens} with user_id")
+
+
 @router.get("/application-form")
 async def get_application_form_compat():
     """
@@ -66,8 +109,9 @@ async def upload_application_form_compat(file: UploadFile = File(...)):
                 detail="No file provided",
             )
 
-        # Read the file once to consume the upload; result is ignored.
-        await file.read()
+        # The multipart body is already spooled by the time we get here; nothing is
+        # kept, so release the spool instead of reading it back into memory.
+        await file.close()
 
         return {
             "success": True,
@@ -99,7 +143,8 @@ async def get_my_assignments(current_student: dict = Depends(get_current_student
         for assignment in assignments:
             slot_data = assignment.get('interview_slots')
             if slot_data:
-                # Handle nested slot data
+                # Handle nested slot data. Embedded rows are raw DB rows (capacity/booked_count,
+                # UTC timestamps) that have not been through SlotService's mapping, so validate them
                 if isinstance(slot_data, dict):
                     slot = SlotResponse(**slot_data)
                 elif isinstance(slot_data, list) and len(slot_data) > 0:
@@ -132,6 +177,7 @@ async def get_my_assignments(current_student: dict = Depends(get_current_student
 async def select_slot(
     request: SelectSlotRequest,
     http_request: Request,
+    background_tasks: BackgroundTasks,
     current_student: dict = Depends(get_current_student)
 ):
     """
@@ -142,18 +188,23 @@ async def select_slot(
         student_email = current_student['email']
         auth_user_id = current_student['id']
         
-        # Get enrolled_user for fallback name/phone
-        enrolled_user = user_service.get_user_by_email(student_email)
-        
-        print("JWT USER:", auth_user_id)
+        logger.debug("[API] JWT user: %s", auth_user_id)
         slot_id = request.slot_id
         prompt = request.prompt
         
         # REMOVED: Application form check (feature deprecated)
         # application_form = application_form_service.get_form_by_user_id(auth_user_id) ...
 
-        # 3. Get slot details and verify availability
-        slot = slot_service.get_slot(slot_id)
+        # Enrolled user (fallback name/phone), slot and existing assignment are independent
+        # reads, so fetch them concurrently; validation below still runs in order.
+        # The slot is read fresh: another worker may have filled or closed it
+        enrolled_user, slot, assignment = await asyncio.gather(
+            asyncio.to_thread(user_service.get_user_by_email, student_email),
+            asyncio.to_thread(slot_service.get_slot, slot_id, use_cache=False),
+            asyncio.to_thread(assignment_service.get_user_assignment_for_slot, auth_user_id, slot_id, 'assigned'),
+        )
+
+        # 3. Verify slot availability
         if not slot:
             raise HTTPException(status_code=404, detail="Slot not found")
             
@@ -163,16 +214,13 @@ async def select_slot(
         if slot['current_bookings'] >= slot['max_capacity']:
             raise HTTPException(status_code=400, detail="Slot is full")
 
-        # 4. Check for existing assignment for this slot
-        assignments = assignment_service.get_user_assignments(auth_user_id, status='assigned')
-        assignment = next((a for a in assignments if a['slot_id'] == slot_id), None)
-        
+        # 4. Use the existing assignment for this slot (fetched above)
         # If no assignment exists but slot is public/available, we can create one or allow it?
         # Current logic seems to prefer assignments. If none found, we'll try to create a virtual one.
         if not assignment:
             logger.info(f"[API] Student {auth_user_id} selecting slot directly: {slot_id}")
             try:
-                new_assignments = assignment_service.assign_slots_to_user(auth_user_id, [slot_id])
+                new_assignments = await asyncio.to_thread(assignment_service.assign_slots_to_user, auth_user_id, [slot_id])
                 if new_assignments:
                     assignment = new_assignments[0]
                 else:
@@ -185,8 +233,8 @@ async def select_slot(
         slot_datetime_str = slot.get('slot_datetime') or slot.get('start_time')
         scheduled_at = parse_datetime_safe(slot_datetime_str)
 
-        # 6. Create booking
-        token = booking_service.create_booking(
+        # 6. Build the booking; it is written together with the updates below
+        booking = booking_service.build_booking(
             name=current_student.get('name', enrolled_user.get('name', 'Student') if enrolled_user else 'Student'),
             email=student_email,
             scheduled_at=scheduled_at,
@@ -199,12 +247,42 @@ async def select_slot(
             application_form_id=None, # Form removed
             prompt=prompt # Include the prompt from the request
         )
+        token = booking['token']
 
-        # 7. Update status: mark assignment used, cancel others, increment count
-        assignment_service.select_slot_for_user(auth_user_id, assignment['id'])
-        assignment_service.cancel_other_assignments(auth_user_id, assignment['id'])
-        slot_service.increment_booking_count(slot_id)
-        user_service.update_user(auth_user_id, interview_status='slot_selected')
+        # 7. Insert booking, mark assignment used, cancel others, increment count, update status.
+        # One transaction (with a locked capacity re-check) via the finalize_slot_selection()
+        # DB function when it is installed
+        try:
+            finalized = await asyncio.to_thread(
+                assignment_service.finalize_slot_selection,
+                auth_user_id, student_email, assignment['id'], slot_id, booking,
+            )
+        except SlotUnavailableError as e:
+            slot_service.invalidate_slot(slot_id)
+            raise HTTPException(status_code=400, detail=e.message)
+        if finalized:
+            # The writes bypassed the services, so drop their cached copies here
+            slot_service.invalidate_slot(slot_id)
+            user_service.invalidate_user(email=student_email)
+        else:
+            await asyncio.to_thread(booking_service.insert_booking, booking)
+            # The remaining writes touch independent rows, so run them concurrently.
+            updates = [
+                asyncio.to_thread(assignment_service.select_slot_for_user, auth_user_id, assignment['id']),
+                asyncio.to_thread(assignment_service.cancel_other_assignments, auth_user_id, assignment['id']),
+                asyncio.to_thread(slot_service.increment_booking_count, slot_id),
+            ]
+            if enrolled_user:
+                # enrolled_users has its own id, separate from the auth user id
+                updates.append(asyncio.to_thread(
+                    user_service.update_user, enrolled_user['id'], interview_status='slot_selected'
+                ))
+            results = await asyncio.gather(*updates, return_exceptions=True)
+            failures = [r for r in results if isinstance(r, Exception)]
+            for failure in failures:
+                logger.warning(f"[API] ⚠️ Post-booking update failed for slot {slot_id}: {failure}")
+            if failures:
+                raise failures[0]
 
         # 8. Generate interview URL and send email
         base_url = get_frontend_url(http_request)
@@ -221,7 +299,8 @@ async def select_slot(
             except Exception as e:
                 logger.warning(f"[API] ⚠️ Failed to send interview email: {e}")
         
-        asyncio.create_task(send_email_bg())
+        # Runs after the response is sent
+        background_tasks.add_task(send_email_bg)
         
         return ScheduleInterviewResponse(
             ok=True,
@@ -241,7 +320,11 @@ async def select_slot(
         )
 
 @router.get("/my-interview", response_model=MyInterviewResponse)
-async def get_my_interview(http_request: Request, current_student: dict = Depends(get_current_student)):
+async def get_my_interview(
+    http_request: Request,
+    background_tasks: BackgroundTasks,
+    current_student: dict = Depends(get_current_student),
+):
     """
     Get student's interview status across all stages (enrolled/scheduled/completed).
     """
@@ -249,188 +332,166 @@ async def get_my_interview(http_request: Request, current_student: dict = Depend
         student_id = current_student['id']
         student_email = current_student['email']
         
+        # Service calls below use the synchronous Supabase client, so they run via
+        # asyncio.to_thread (as in select_slot) and independent ones are gathered
+
         # Get enrolled_user for legacy data fallback
-        enrolled_user = user_service.get_user_by_email(student_email)
-        
-        # Get current time
-        now = get_now_ist()
-        logger.info(f"[API] Current IST time: {now.isoformat()}")
-        
-        logger.info(f"[API] Checking bookings by email: {student_email}")
-        email_bookings = booking_service.get_bookings_by_email(student_email)
-        logger.info(f"[API] Found {len(email_bookings)} bookings by email: {student_email}")
+        enrolled_user = await asyncio.to_thread(user_service.get_user_by_email, student_email)
         
         # Use student_id (auth ID) as primary, but fallback to enrolled_user_id for legacy cleanup
         user_id = student_id
         legacy_user_id = enrolled_user['id'] if enrolled_user else None
-        
-        user_id_bookings = booking_service.get_bookings_by_user_id(user_id)
+        user_ids = [user_id]
         if legacy_user_id and legacy_user_id != user_id:
-            legacy_bookings = booking_service.get_bookings_by_user_id(legacy_user_id)
-            user_id_bookings.extend(legacy_bookings)
-            
-        logger.info(f"[API] Found {len(user_id_bookings)} total bookings by user IDs")
-        seen_tokens = set()
+            user_ids.append(legacy_user_id)
+
+        # One query for email OR user_id matches; rows come back distinct, so no token dedupe needed
+        logger.debug("[API] Checking bookings by email %s or user IDs %s", student_email, user_ids)
+        fetched_bookings = await asyncio.to_thread(
+            booking_service.get_bookings_by_email_or_user_ids, student_email, user_ids
+        )
+        # Get current time
+        now = get_now_ist()
+        logger.debug("[API] Current IST time: %s", now)
+
+        # One pass collects the bookings, the tokens needing a user_id backfill, the slot ids
+        # and the bookings that may need completion evidence: a window can only have passed
+        # if it started before now, whatever the slot's duration turns out to be
         all_bookings_data = []
-        for booking in email_bookings + user_id_bookings:
+        backfill_tokens = []
+        slot_ids = set()
+        scheduled_by_token = {}
+        evidence_tokens = []
+        for booking in fetched_bookings:
             token = booking.get('token')
-            if token and token not in seen_tokens:
-                seen_tokens.add(token)
-                slot = slot_service.get_slot(booking['slot_id']) if booking.get('slot_id') else None
-                booking['slot'] = slot
-                booking['interview_slots'] = slot
-                all_bookings_data.append(booking)
-        for booking in email_bookings:
-            if not booking.get('user_id') and user_id and booking.get('token'):
-                try:
-                    booking_service.update_booking(booking['token'], user_id=user_id)
-                    booking['user_id'] = user_id
-                    logger.info(f"[API] ✅ Updated booking {booking['token']} with user_id: {user_id}")
-                except Exception as e:
-                    logger.warning(f"[API] Failed to update booking {booking.get('token')}: {e}")
+            if not token:
+                continue
+            all_bookings_data.append(booking)
+            # Email-matched bookings with no user_id (user_id matches always have one)
+            if not booking.get('user_id'):
+                backfill_tokens.append(token)
+            if booking.get('slot_id'):
+                slot_ids.add(booking['slot_id'])
+            try:
+                # Parse the stored datetime - handle UTC or IST format properly
+                scheduled_at = parse_datetime_safe(booking['scheduled_at'])
+            except (ValueError, KeyError, TypeError):
+                continue
+            scheduled_by_token[token] = scheduled_at
+            # Status-completed bookings need no evidence
+            if scheduled_at < now and booking.get('status') != 'completed':
+                evidence_tokens.append(token)
+        if not all_bookings_data:
+            # Nothing booked yet (e.g. freshly enrolled student): skip slot/completion lookups
+            return _json_with_etag(
+                http_request, MyInterviewResponse(upcoming=[], missed=[], completed=[]).model_dump_json().encode()
+            )
+        if backfill_tokens and user_id:
+            # The response never reads user_id, so this GET does not wait on the write:
+            # one bulk UPDATE runs after the response is sent
+            background_tasks.add_task(_backfill_booking_user_id, backfill_tokens, user_id)
+        async def fetch_completion_evidence() -> set:
+            # Tokens with an evaluation or transcript; a failed lookup counts as no evidence
+            if not evidence_tokens:
+                return set()
+            try:
+                evaluation_tokens, transcript_tokens = await asyncio.gather(
+                    asyncio.to_thread(evaluation_service.get_booking_tokens_with_evaluations, evidence_tokens),
+                    asyncio.to_thread(transcript_storage_service.get_booking_tokens_with_transcripts, evidence_tokens),
+                )
+                logger.debug(
+                    "[API] Completion evidence: evals: %d, transcripts: %d", len(evaluation_tokens), len(transcript_tokens)
+                )
+                return evaluation_tokens | transcript_tokens
+            except Exception as e:
+                logger.warning(f"[API] Failed to fetch completion evidence: {e}")
+                return set()
+
+        # Both lookups depend only on the bookings: fetch every referenced slot in one query
+        # (each booking picks up its slot in the classification loop below) while the
+        # completion evidence is fetched alongside
+        slots_by_id, evidence = await asyncio.gather(
+            asyncio.to_thread(slot_service.get_slots_by_ids, list(slot_ids)),
+            fetch_completion_evidence(),
+        )
         if not enrolled_user:
             logger.warning(f"[API] No enrolled_user for email {student_email}, using email-based bookings only")
-        class MockResult:
-            def __init__(self, data):
-                self.data = data
-        all_bookings = MockResult(all_bookings_data)
-        logger.info(f"[API] Total unique bookings found: {len(all_bookings_data)}")
-        completed_tokens = set()
-        if all_bookings.data:
-            booking_tokens = [b.get('token') for b in all_bookings.data if b.get('token')]
-            if booking_tokens:
-                try:
-                    evaluation_tokens = evaluation_service.get_booking_tokens_with_evaluations(booking_tokens)
-                    transcript_tokens = transcript_storage_service.get_booking_tokens_with_transcripts(booking_tokens)
-                    completed_status_tokens = {b.get('token') for b in all_bookings.data if b.get('status') == 'completed'}
-                    completed_tokens = evaluation_tokens | transcript_tokens | completed_status_tokens
-                    logger.info(f"[API] Completed: {len(completed_tokens)} (evals: {len(evaluation_tokens)}, transcripts: {len(transcript_tokens)}, status: {len(completed_status_tokens)})")
-                except Exception as e:
-                    logger.warning(f"[API] Failed to fetch completion evidence: {e}")
-        
-        # Separate upcoming, missed, and completed interviews
-        upcoming_bookings = []
-        missed_bookings = []
-        completed_bookings = []
+        logger.debug("[API] Total unique bookings found: %d", len(all_bookings_data))
+
+        # Resolve the frontend base URL once for all links built below
+        base_url = get_frontend_url(http_request)
+        interview_prefix = f"{base_url}/interview/" if base_url else "/interview/"
+        evaluation_prefix = f"{base_url}/evaluation/" if base_url else "/evaluation/"
+
+        # Split by time: upcoming entries are built right here, while only bookings whose
+        # window has passed can be completed or missed.
+        # Bookings arrive ordered by scheduled_at, so upcoming is already soonest first.
+        upcoming = []
+        past_bookings = []
         
-        if all_bookings.data:
-            for booking in all_bookings.data:
+        if all_bookings_data:
+            for booking in all_bookings_data:
+                slot = slots_by_id.get(booking['slot_id']) if booking.get('slot_id') else None
+                booking['slot'] = slot
+                booking['interview_slots'] = slot
+                scheduled_at = scheduled_by_token.get(booking['token'])
+                if scheduled_at is None:
+                    continue
                 try:
-                    # Parse the stored datetime - handle UTC or IST format properly
-                    scheduled_at_str = booking['scheduled_at']
-                    scheduled_at = parse_datetime_safe(scheduled_at_str)
-                    booking_token = booking.get('token')
-                    booking_status = booking.get('status', 'scheduled')
-                    
-                    # Get interview duration from slot if available, otherwise default to 30 minutes
-                    duration_minutes = 30  # Default duration
+                    # Interview duration from the slot, otherwise default to 30 minutes.
+                    # duration_minutes is stored on every slot row; SlotService only derives
+                    # end_time from it, so there is no separate end_time to parse here
                     slot_data = booking.get('interview_slots')
-                    if slot_data:
-                        if slot_data.get('duration_minutes'):
-                            duration_minutes = slot_data['duration_minutes']
-                        elif slot_data.get('end_time') and slot_data.get('slot_datetime'):
-                            # Calculate duration from slot start and end times
-                            try:
-                                slot_start_str = slot_data.get('slot_datetime', '')
-                                slot_end_str = slot_data.get('end_time', '')
-                                if slot_start_str and slot_end_str:
-                                    slot_start = parse_datetime_safe(slot_start_str)
-                                    slot_end = parse_datetime_safe(slot_end_str)
-                                    duration_minutes = int((slot_end - slot_start).total_seconds() / 60)
-                            except (ValueError, TypeError) as e:
-                                logger.warning(f"[API] Failed to calculate duration from slot times: {e}")
-                                pass  # Use default duration if calculation fails
+                    duration_minutes = (slot_data.get('duration_minutes') if slot_data else None) or 30
                     
                     # Calculate interview end time
                     interview_end_time = scheduled_at + timedelta(minutes=duration_minutes)
                     
                     # Check if interview window has passed (end time, not start time)
-                    time_diff = (interview_end_time - now).total_seconds() / 60  # minutes
-                    
                     if interview_end_time < now:
-                        # Interview window has passed - check if it was completed
-                        # Mark as completed if:
-                        # 1. Booking status is 'completed', OR
-                        # 2. There's an evaluation record (interview was actually conducted), OR
-                        # 3. There's a transcript (interview was conducted)
-                        is_completed = (
-                            booking_status == 'completed' or 
-                            booking_token in completed_tokens or
-                            booking.get('status') == 'completed'
-                        )
-                        
-                        if is_completed:
-                            completed_bookings.append(booking)
-                        else:
-                            # Interview window passed but not completed = missed
-                            missed_bookings.append(booking)
+                        # Interview window has passed - completed or missed, decided below
+                        past_bookings.append(booking)
                     else:
                         # Interview window hasn't passed yet = upcoming
-                        upcoming_bookings.append(booking)
+                        upcoming.append(
+                            _build_interview_entry(booking, 'interview_url', interview_prefix + booking['token'])
+                        )
                 except (ValueError, KeyError, TypeError) as e:
                     pass
-        
-        # Build upcoming interviews list
-        upcoming = []
-        for booking in sorted(upcoming_bookings, key=lambda x: x.get('scheduled_at', '')):
-            slot_data = booking.get('interview_slots')
-            base_url = get_frontend_url(http_request)
-            interview_url = f"{base_url}/interview/{booking['token']}" if base_url else f"/interview/{booking['token']}"
-            
-            upcoming.append({
-                'booking': {
-                    'token': booking['token'],
-                    'scheduled_at': booking['scheduled_at'],
-                    'interview_url': interview_url,
-                    'name': booking.get('name'),
-                    'email': booking.get('email'),
-                },
-                'slot': slot_data if slot_data else None,
-            })
-        
-        # Build missed interviews list
+
+        # Status-completed bookings count even if the evidence lookup failed
+        completed_status_tokens = {b['token'] for b in past_bookings if b.get('status') == 'completed'}
+        completed_tokens = evidence | completed_status_tokens
+        logger.debug("[API] Completed: %d (status: %d)", len(completed_tokens), len(completed_status_tokens))
+
+        # completed_tokens covers all three signals: status 'completed', an evaluation
+        # record, or a transcript; a passed window without any of them = missed.
+        # Walking past_bookings backwards gives missed/completed most recent first
         missed = []
-        for booking in sorted(missed_bookings, key=lambda x: x.get('scheduled_at', ''), reverse=True):
-            slot_data = booking.get('interview_slots')
-            base_url = get_frontend_url(http_request)
-            interview_url = f"{base_url}/interview/{booking['token']}" if base_url else f"/interview/{booking['token']}"
-            
-            missed.append({
-                'booking': {
-                    'token': booking['token'],
-                    'scheduled_at': booking['scheduled_at'],
-                    'interview_url': interview_url,
-                    'name': booking.get('name'),
-                    'email': booking.get('email'),
-                    'status': booking.get('status', 'scheduled'),
-                },
-                'slot': slot_data if slot_data else None,
-            })
-        
-        # Build completed interviews list
         completed = []
-        for booking in sorted(completed_bookings, key=lambda x: x.get('scheduled_at', ''), reverse=True):
-            slot_data = booking.get('interview_slots')
-            base_url = get_frontend_url(http_request)
-            evaluation_url = f"{base_url}/evaluation/{booking['token']}" if base_url else f"/evaluation/{booking['token']}"
-            
-            completed.append({
-                'booking': {
-                    'token': booking['token'],
-                    'scheduled_at': booking['scheduled_at'],
-                    'evaluation_url': evaluation_url,
-                    'name': booking.get('name'),
-                    'email': booking.get('email'),
-                    'status': booking.get('status', 'completed'),
-                },
-                'slot': slot_data if slot_data else None,
-            })
-        
-        return MyInterviewResponse(
+        for booking in reversed(past_bookings):
+            token = booking['token']
+            if token in completed_tokens:
+                completed.append(
+                    _build_interview_entry(booking, 'evaluation_url', evaluation_prefix + token, default_status='completed')
+                )
+            else:
+                missed.append(
+                    _build_interview_entry(booking, 'interview_url', interview_prefix + token, default_status='scheduled')
+                )
+
+        # The entries are plain dicts built above; validating them as Dict[str, Any] would
+        # deep-copy every nested booking/slot dict (twice, via response_model), so construct
+        # the model without validation and encode it in one pass
+        result = MyInterviewResponse.model_construct(
             upcoming=upcoming,
             missed=missed,
             completed=completed
         )
+        # Polled by the frontend: unchanged results go back as a bodiless 304. The ETag is taken
+        # over the body itself, since entries also move between lists as time passes
+        # and evaluations/transcripts arrive, not only when bookings change
+        return _json_with_etag(http_request, result.model_dump_json().encode())
         
     except Exception as e:
         error_msg = f"Failed to fetch interview status: {str(e)}"
@@ -1,7 +1,8 @@
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import timedelta
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, UploadFile, File, status
+from pydantic import TypeAdapter
 
 from app.schemas.users import (
     EnrollUserRequest,
@@ -25,12 +26,19 @@ from app.services.container import (
 from app.utils.logger import get_logger
 from app.utils.auth_dependencies import get_current_admin
 from app.db.supabase import get_supabase
-from app.utils.datetime_utils import get_now_ist, IST, to_ist
+from app.utils.datetime_utils import get_now_ist, parse_iso_to_ist
 
 logger = get_logger(__name__)
-import pandas as pd
+import openpyxl
 from io import BytesIO
 import asyncio
+import re
+
+# Enrollment only assigns slots starting within this window
+_ENROLLMENT_SLOT_WINDOW = timedelta(days=2)
+
+# Built once; validates and serializes user lists straight to JSON bytes in pydantic-core
+_USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
 
 # Admin-facing enrolled user management endpoints
 router = APIRouter(tags=["Users"])
@@ -49,55 +57,16 @@ async def enroll_user(
     try:
         logger.info(f"[API] Enrolling user: {request.email}")
 
-        # Generate temporary password
-        temporary_password = auth_service.generate_temporary_password()
-
-        # Create student account with temporary password
-        try:
-            student = auth_service.register_student(
-                email=request.email,
-                password=temporary_password,
-                name=request.name,
-                phone=request.phone,
-                must_change_password=True,
-            )
-        except Exception as e:
-            error_msg = str(e)
-            if "already registered" in error_msg.lower() or "unique constraint" in error_msg.lower():
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"User with email {request.email} already exists",
-                )
-            raise
+        # One reference time for both the auto-assign window and manual slot validation
+        now = get_now_ist()
+        slot_cutoff = now + _ENROLLMENT_SLOT_WINDOW
 
-        # Validate or Auto-assign slots
+        # Validate or Auto-assign slots (reads only, so a rejected request creates nothing)
         target_slot_ids = request.slot_ids
         if not target_slot_ids:
-            try:
-                now = get_now_ist()
-                two_days_from_now = now + timedelta(days=2)
-                all_slots = slot_service.get_all_slots(status="active", include_past=False)
-
-                target_slot_ids = []
-                for slot in all_slots:
-                    try:
-                        slot_dt_str = slot["slot_datetime"]
-                        if slot_dt_str.endswith("Z") or "+" in slot_dt_str:
-                            slot_dt = to_ist(datetime.fromisoformat(slot_dt_str.replace("Z", "+00:00")))
-                        else:
-                            slot_dt = datetime.fromisoformat(slot_dt_str).replace(tzinfo=IST)
-
-                        if (
-                            slot_dt >= now
-                            and slot_dt <= two_days_from_now
-                            and slot.get("current_bookings", 0) < slot.get("max_capacity", 1)
-                        ):
-                            target_slot_ids.append(slot["id"])
-                    except Exception:
-                        continue
-                logger.info(f"[API] Auto-assigned {len(target_slot_ids)} slots to user {request.email}")
-            except Exception as e:
-                logger.error(f"[API] Failed to auto-assign slots: {str(e)}")
+            # A failed slot fetch raises (500) rather than enrolling the user with no slots
+            target_slot_ids = slot_service.get_auto_assign_slot_ids(_ENROLLMENT_SLOT_WINDOW, now=now)
+            logger.info(f"[API] Auto-assigned {len(target_slot_ids)} slots to user {request.email}")
         
         if not target_slot_ids:
             logger.warning(f"[API] No available slots found for auto-assignment for {request.email}. Proceeding without slot assignment.")
@@ -106,10 +75,10 @@ async def enroll_user(
             if len(target_slot_ids) < 10:
                 logger.warning(f"[API] User {request.email} provided only {len(target_slot_ids)} slots. Proceeding despite recommendation of 10.")
 
-
-            two_days_from_now = get_now_ist() + timedelta(days=2)
+            # Read fresh: these checks gate an assignment, and the slot cache is per process
+            slots_by_id = slot_service.get_slots_by_ids(list(dict.fromkeys(target_slot_ids)), use_cache=False)
             for slot_id in target_slot_ids:
-                slot = slot_service.get_slot(slot_id)
+                slot = slots_by_id.get(slot_id)
                 if not slot:
                     logger.warning(f"[API] Enrollment failed: Slot {slot_id} not found")
                     raise HTTPException(
@@ -123,13 +92,9 @@ async def enroll_user(
                         detail=f"Slot {slot_id} is not active",
                     )
                 try:
-                    slot_datetime_str = slot["slot_datetime"]
-                    if slot_datetime_str.endswith("Z") or "+" in slot_datetime_str:
-                        slot_datetime = to_ist(datetime.fromisoformat(slot_datetime_str.replace("Z", "+00:00")))
-                    else:
-                        slot_datetime = datetime.fromisoformat(slot_datetime_str).replace(tzinfo=IST)
+                    slot_datetime = parse_iso_to_ist(slot["slot_datetime"])
 
-                    if slot_datetime > two_days_from_now:
+                    if slot_datetime > slot_cutoff:
                         raise HTTPException(
                             status_code=status.HTTP_400_BAD_REQUEST,
                             detail=f"All slots must be within the next 2 days. Slot {slot_id} is beyond that.",
@@ -137,18 +102,64 @@ async def enroll_user(
                 except (ValueError, KeyError, TypeError):
                     pass
 
-        # Create enrolled_users record
-        user = user_service.create_user(
-            name=request.name,
-            email=request.email,
-            phone=request.phone,
-            notes=request.notes,
+        # Reject an already-registered email before writing anything
+        if await asyncio.to_thread(auth_service.get_existing_emails, [request.email]):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"User with email {request.email} already exists",
+            )
+
+        # Generate temporary password
+        temporary_password = auth_service.generate_temporary_password()
+
+        # The student account (users) and the enrolled_users record are independent rows:
+        # create both at once instead of one round-trip after the other. If only one of them
+        # succeeds (e.g. a concurrent registration of the same email), it is removed again.
+        student_result, user_result = await asyncio.gather(
+            asyncio.to_thread(
+                auth_service.register_student,
+                email=request.email,
+                password=temporary_password,
+                name=request.name,
+                phone=request.phone,
+                must_change_password=True,
+            ),
+            asyncio.to_thread(
+                user_service.create_user,
+                name=request.name,
+                email=request.email,
+                phone=request.phone,
+                notes=request.notes,
+            ),
+            return_exceptions=True,
         )
+        if isinstance(student_result, Exception):
+            if not isinstance(user_result, Exception):
+                # No account was created, so drop the enrolled user made alongside it
+                if not await asyncio.to_thread(user_service.delete_user, user_result["id"]):
+                    logger.error(f"[API] Could not remove enrolled user {user_result['id']} after failed registration")
+            if _is_duplicate_error(student_result):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"User with email {request.email} already exists",
+                )
+            raise student_result
+        if isinstance(user_result, Exception):
+            # No enrolled user was created, so drop the login made alongside it
+            if not await asyncio.to_thread(auth_service.delete_student_by_email, request.email):
+                logger.error(f"[API] Could not remove student login {request.email} after failed enrollment")
+            if _is_duplicate_error(user_result):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Enrolled user with email {request.email} already exists",
+                )
+            raise user_result
+        user = user_result
 
         # Assign slots to user
         if target_slot_ids:
             try:
-                assignment_service.assign_slots_to_user(user["id"], target_slot_ids)
+                await asyncio.to_thread(assignment_service.assign_slots_to_user, user["id"], target_slot_ids)
                 logger.info(f"[API] ✅ Assigned {len(target_slot_ids)} slots to user {user['id']}")
             except Exception as e:
                 logger.warning(f"[API] ⚠️ Failed to assign slots: {str(e)}")
@@ -171,7 +182,8 @@ async def enroll_user(
             except Exception as e:
                 logger.error(f"[API] ❌ Exception while sending enrollment email to {request.email}: {str(e)}")
 
-        asyncio.create_task(send_enrollment_email_bg())
+        # Runs after the response is sent
+        background_tasks.add_task(send_enrollment_email_bg)
 
         return UserResponse(**user)
 
@@ -186,8 +198,22 @@ async def enroll_user(
         )
 
 
+_DUPLICATE_ERROR_RE = re.compile(r"already registered|already exists|unique constraint", re.IGNORECASE)
+
+
+def _is_duplicate_error(error) -> bool:
+    """True if an account/enrolled-user creation error (exception or message) means the email is taken."""
+    return _DUPLICATE_ERROR_RE.search(str(error)) is not None
+
+
+def _cell_text(value) -> str:
+    """Spreadsheet cell as stripped text; empty cells become ''."""
+    return str(value).strip() if value is not None else ""
+
+
 @router.post("/bulk-enroll", response_model=BulkEnrollResponse)
 async def bulk_enroll_users(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_admin: dict = Depends(get_current_admin),
 ):
@@ -197,125 +223,163 @@ async def bulk_enroll_users(
     try:
         logger.info(f"[API] Bulk enrolling users from file: {file.filename}")
 
+        # Rows are streamed from a read-only workbook rather than loaded into a DataFrame
         try:
             contents = await file.read()
-            df = pd.read_excel(BytesIO(contents))
+            workbook = openpyxl.load_workbook(BytesIO(contents), read_only=True, data_only=True)
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, ())
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to read Excel file: {str(e)}",
             )
 
-        required_columns = ["name", "email"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=(
-                    f"Missing required columns: {', '.join(missing_columns)}. "
-                    f"Expected columns: {', '.join(required_columns)} (phone and notes are optional)"
-                ),
-            )
-
-        total = len(df)
-        successful = 0
-        failed = 0
-        errors: List[str] = []
-
-        now_dt = get_now_ist()
-        two_days_from_now = now_dt + timedelta(days=2)
-        all_slots = slot_service.get_all_slots(status="active", include_past=False)
-        auto_assign_slot_ids: List[str] = []
-        for slot in all_slots:
-            try:
-                slot_dt_str = slot["slot_datetime"]
-                if slot_dt_str.endswith("Z") or "+" in slot_dt_str:
-                    slot_dt = to_ist(datetime.fromisoformat(slot_dt_str.replace("Z", "+00:00")))
-                else:
-                    slot_dt = datetime.fromisoformat(slot_dt_str).replace(tzinfo=IST)
-
-                if (
-                    slot_dt >= now_dt
-                    and slot_dt <= two_days_from_now
-                    and slot.get("current_bookings", 0) < slot.get("max_capacity", 1)
-                ):
-                    auto_assign_slot_ids.append(slot["id"])
-            except Exception:
-                continue
-
-        logger.info(f"[API] Bulk enrollment will auto-assign {len(auto_assign_slot_ids)} slots to each user")
-
-        for idx, row in df.iterrows():
-            try:
-
-                name = str(row["name"]).strip()
-                email = str(row["email"]).strip()
-                phone = str(row.get("phone", "")).strip() if pd.notna(row.get("phone")) else None
-                notes = str(row.get("notes", "")).strip() if pd.notna(row.get("notes")) else None
+        try:
+            col_idx = {name: i for i, name in enumerate(header) if name is not None}
+            required_columns = ["name", "email"]
+            missing_columns = [col for col in required_columns if col not in col_idx]
+            if missing_columns:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        f"Missing required columns: {', '.join(missing_columns)}. "
+                        f"Expected columns: {', '.join(required_columns)} (phone and notes are optional)"
+                    ),
+                )
 
+            # Resolve column positions once; optional columns that are absent skip per-row work
+            name_i, email_i = col_idx["name"], col_idx["email"]
+            phone_i, notes_i = col_idx.get("phone"), col_idx.get("notes")
+
+            def column(row: tuple, i: Optional[int]) -> str:
+                return _cell_text(row[i]) if i is not None and i < len(row) else ""
+
+            # Row errors keyed by spreadsheet row number (header is row 1), reported in row order
+            row_errors: Dict[int, str] = {}
+
+            # 1. Validate rows and give each a temporary password
+            candidates: List[dict] = []
+            total = 0
+            for row_num, row in enumerate(rows, start=2):
+                if all(value is None for value in row):
+                    continue  # blank rows (read-only sheets can report trailing ones)
+                total += 1
+                name = column(row, name_i)
+                email = column(row, email_i)
                 if not name or not email:
-                    raise ValueError("name and email are required and cannot be empty")
-
-                temporary_password = auth_service.generate_temporary_password()
+                    row_errors[row_num] = f"Row {row_num}: name and email are required and cannot be empty"
+                    continue
+                candidates.append({
+                    "row": row_num,
+                    "name": name,
+                    "email": email,
+                    "phone": column(row, phone_i) or None,
+                    "notes": column(row, notes_i) or None,
+                    "password": auth_service.generate_temporary_password(),
+                    "must_change_password": True,
+                })
+        finally:
+            workbook.close()
+
+        auto_assign_slot_ids = slot_service.get_auto_assign_slot_ids(_ENROLLMENT_SLOT_WINDOW)
 
-                try:
-                    student = auth_service.register_student(
-                        email=email,
-                        password=temporary_password,
-                        name=name,
-                        phone=phone,
-                        must_change_password=True,
-                    )
-                except Exception as e:
-                    error_msg = str(e)
-                    if "already registered" in error_msg.lower() or "unique constraint" in error_msg.lower():
-                        raise ValueError(f"User with email {email} already exists")
-                    raise ValueError(f"Failed to create student account: {str(e)}")
+        logger.info(f"[API] Bulk enrollment will auto-assign {len(auto_assign_slot_ids)} slots to each user")
 
+        # 2. Student accounts: one existence check up front, so duplicate rows (already
+        #    registered, or repeated within the sheet) are rejected without any insert attempt
+        existing_emails = auth_service.get_existing_emails(c["email"] for c in candidates)
+        seen_emails = set(existing_emails)
+        new_candidates = []
+        for c in candidates:
+            if c["email"] in seen_emails:
+                row_errors[c["row"]] = f"Row {c['row']}: User with email {c['email']} already exists"
+                continue
+            seen_emails.add(c["email"])
+            new_candidates.append(c)
+
+        _, register_errors = auth_service.register_students_bulk(new_candidates, existing_emails)
+        registered = []
+        for c in new_candidates:
+            error = register_errors.get(c["email"])
+            if error is None:
+                registered.append(c)
+            elif _is_duplicate_error(error):
+                row_errors[c["row"]] = f"Row {c['row']}: User with email {c['email']} already exists"
+            else:
+                row_errors[c["row"]] = f"Row {c['row']}: Failed to create student account: {error}"
+
+        # 3. Enrolled users: one insert; per-row inserts only if the batch is rejected
+        enrolled = []
+        try:
+            users = user_service.create_users_bulk(registered)
+            by_email = {u["email"]: u for u in users}
+            enrolled = [(c, by_email[c["email"]]) for c in registered if c["email"] in by_email]
+        except Exception as e:
+            logger.warning(f"[API] ⚠️ Bulk enrolled-user insert failed, inserting one by one: {str(e)}")
+            for c in registered:
                 try:
                     user = user_service.create_user(
-                        name=name,
-                        email=email,
-                        phone=phone,
-                        notes=notes,
+                        name=c["name"], email=c["email"], phone=c["phone"], notes=c["notes"],
                     )
+                    enrolled.append((c, user))
                 except Exception as e:
-                    error_msg = str(e)
-                    if "unique constraint" in error_msg.lower() or "already exists" in error_msg.lower():
-                        raise ValueError(f"Enrolled user with email {email} already exists")
-                    raise ValueError(f"Failed to create enrolled user: {str(e)}")
-
-                if auto_assign_slot_ids:
-                    try:
-                        assignment_service.assign_slots_to_user(user["id"], auto_assign_slot_ids)
-                        logger.info(f"[API] ✅ Auto-assigned {len(auto_assign_slot_ids)} slots to user {user['id']}")
-                    except Exception as e:
-                        logger.warning(f"[API] ⚠️ Failed to auto-assign slots for {email}: {str(e)}")
-
-                async def send_enrollment_email_bg(email_addr: str, name_val: str, temp_pass: str):
-                    try:
-                        await email_service.send_enrollment_email(
-                            to_email=email_addr,
-                            name=name_val,
-                            email=email_addr,
-                            temporary_password=temp_pass,
-                        )
-                        logger.info(f"[API] ✅ Bulk enrollment email sent to {email_addr}")
-                    except Exception as e:
-                        logger.warning(f"[API] ⚠️ Bulk enrollment email failed for {email_addr}: {str(e)}")
+                    if _is_duplicate_error(e):
+                        row_errors[c["row"]] = f"Row {c['row']}: Enrolled user with email {c['email']} already exists"
+                    else:
+                        row_errors[c["row"]] = f"Row {c['row']}: Failed to create enrolled user: {str(e)}"
+
+        # Rows whose enrolled user was not created must not keep their new login, or the
+        # orphan would block re-enrolling the email (same compensation as enroll_user)
+        enrolled_emails = {c["email"] for c, _ in enrolled}
+        orphaned = [c for c in registered if c["email"] not in enrolled_emails]
+        if orphaned:
+            removed = auth_service.delete_students_by_emails(c["email"] for c in orphaned)
+            for c in orphaned:
+                error = row_errors.get(c["row"], f"Row {c['row']}: Failed to create enrolled user")
+                if c["email"] not in removed:
+                    logger.error(f"[API] Could not remove student login {c['email']} after failed enrollment")
+                    error += " (student login was created and could not be removed; remove it before re-enrolling)"
+                row_errors[c["row"]] = error
+
+        # 4. Slot assignments for every enrolled user in one insert
+        if auto_assign_slot_ids and enrolled:
+            try:
+                assignment_service.assign_slots_to_users([u["id"] for _, u in enrolled], auto_assign_slot_ids)
+                logger.info(f"[API] ✅ Auto-assigned {len(auto_assign_slot_ids)} slots to {len(enrolled)} users")
+            except Exception as e:
+                logger.warning(f"[API] ⚠️ Failed to auto-assign slots for bulk enrollment: {str(e)}")
 
-                asyncio.create_task(send_enrollment_email_bg(email, name, temporary_password))
+        async def send_enrollment_email_bg(email_addr: str, name_val: str, temp_pass: str) -> bool:
+            try:
+                sent, _ = await email_service.send_enrollment_email(
+                    to_email=email_addr,
+                    name=name_val,
+                    email=email_addr,
+                    temporary_password=temp_pass,
+                )
+                return sent
+            except Exception as e:
+                logger.warning(f"[API] ⚠️ Bulk enrollment email failed for {email_addr}: {str(e)}")
+                return False
 
-                successful += 1
-                logger.info(f"[API] ✅ Enrolled user {idx + 1}/{total}: {email}")
+        async def send_all_enrollment_emails(recipients: List[dict]):
+            # EmailService caps concurrent SMTP sessions, so this drains at the provider's pace
+            results = await asyncio.gather(
+                *(send_enrollment_email_bg(c["email"], c["name"], c["password"]) for c in recipients)
+            )
+            # EmailService logs each send; summarise here instead of a line per row
+            logger.info(f"[API] 📧 Bulk enrollment emails sent: {sum(results)}/{len(recipients)}")
 
-            except Exception as e:
-                failed += 1
-                error_msg = f"Row {idx + 2}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(f"[API] {error_msg}")
+        # Runs after the response is sent
+        if enrolled:
+            background_tasks.add_task(send_all_enrollment_emails, [c for c, _ in enrolled])
 
-        await asyncio.sleep(0.1)
+        successful = len(enrolled)
+        failed = len(row_errors)
+        errors = [row_errors[row_num] for row_num in sorted(row_errors)]
+        if errors:
+            logger.error(f"[API] Bulk enrollment: {failed} rows failed:\n" + "\n".join(errors))
 
         logger.info(f"[API] Bulk enrollment complete: {successful}/{total} successful")
 
@@ -349,7 +413,10 @@ async def get_all_users(
     """
     try:
         users = user_service.get_all_users(limit=limit, skip=skip)
-        return [UserResponse(**user) for user in users]
+        return Response(
+            content=_USER_LIST_ADAPTER.dump_json(_USER_LIST_ADAPTER.validate_python(users)),
+            media_type="application/json",
+        )
     except Exception as e:
         error_msg = f"Failed to fetch users: {str(e)}"
         logger.error(f"[API] {error_msg}", exc_info=True)
@@ -373,32 +440,34 @@ async def get_user(user_id: str, current_admin: dict = Depends(get_current_admin
                 detail="User not found",
             )
 
-        bookings = booking_service.get_user_bookings(user_id)
-        if not bookings:
-            user_email = (user.get("email") or "").strip()
-            if user_email:
-                bookings = booking_service.get_bookings_by_email(user_email)
+        # Bookings linked by user_id, plus older ones only matched by email; fetch both at once
+        user_email = (user.get("email") or "").strip()
+        if user_email:
+            id_bookings, email_bookings = await asyncio.gather(
+                asyncio.to_thread(booking_service.get_user_bookings, user_id),
+                asyncio.to_thread(booking_service.get_bookings_by_email, user_email),
+            )
         else:
-            user_email = (user.get("email") or "").strip()
-            if user_email:
-                email_bookings = booking_service.get_bookings_by_email(user_email)
-                seen_tokens = {b.get("token") for b in bookings if b.get("token")}
-                for b in email_bookings:
-                    t = b.get("token")
-                    if t and t not in seen_tokens:
-                        bookings.append(b)
-                        seen_tokens.add(t)
+            id_bookings = await asyncio.to_thread(booking_service.get_user_bookings, user_id)
+            email_bookings = []
+
+        # Keyed by token: user_id matches win, email matches only fill in the rest
+        merged = {b["token"]: b for b in id_bookings}
+        for b in email_bookings:
+            merged.setdefault(b["token"], b)
+        bookings = list(merged.values())
 
         booking_tokens = [b["token"] for b in bookings]
         evaluations = evaluation_service.get_evaluations_for_bookings(booking_tokens)
         eval_map = {e["booking_token"]: e for e in evaluations}
 
+        # Rows come from our own tables, so build the summaries without per-row validation
         interviews: List[InterviewSummary] = []
         for booking in bookings:
             token = booking.get("token")
             evaluation = eval_map.get(token)
 
-            summary = InterviewSummary(
+            summary = InterviewSummary.model_construct(
                 token=token,
                 scheduled_at=booking.get("scheduled_at", ""),
                 status=booking.get("status", "scheduled"),
@@ -414,19 +483,24 @@ async def get_user(user_id: str, current_admin: dict = Depends(get_current_admin
             analytics = evaluation_service.get_student_analytics(booking_tokens)
             overall_analysis = analytics.get("overall_analysis")
             if not overall_analysis:
-                scored_evals = [e for e in evaluations if e.get("overall_feedback")]
-                scored_evals.sort(key=lambda x: x.get("created_at", ""))
-                if scored_evals:
-                    overall_analysis = scored_evals[-1].get("overall_feedback")
+                # Fall back to the most recent evaluation that has feedback
+                latest = max(
+                    (e for e in evaluations if e.get("overall_feedback")),
+                    key=lambda x: x.get("created_at", ""),
+                    default=None,
+                )
+                if latest:
+                    overall_analysis = latest.get("overall_feedback")
         except Exception as e:
             logger.warning(f"[API] Could not compute overall analysis for user {user_id}: {e}")
 
         user_response = UserResponse(**user)
-        return UserDetailResponse(
+        detail = UserDetailResponse(
             **user_response.dict(),
             interviews=interviews,
             overall_analysis=overall_analysis,
         )
+        return Response(content=detail.model_dump_json(), media_type="application/json")
 
     except HTTPException:
         raise
@@ -488,35 +562,68 @@ async def delete_user(user_id: str, current_admin: dict = Depends(get_current_ad
             )
         email = user.get("email")
 
-        bookings = booking_service.get_bookings_by_user_id(user_id)
-        booking_tokens = [b.get("token") for b in bookings if b.get("token")]
-
-        try:
-            if booking_tokens:
-                from app.api.main import transcript_storage_service  # type: ignore
-
-                transcript_storage_service.delete_by_booking_tokens(booking_tokens)
-        except Exception as e:
-            logger.warning(f"[API] Could not delete transcripts for user {user_id}: {e}")
-
-        try:
-            if booking_tokens:
-                evaluation_service.delete_evaluations_by_booking_tokens(booking_tokens)
-        except Exception as e:
-            logger.warning(f"[API] Could not delete evaluations for user {user_id}: {e}")
-
-        try:
-            slot_service.release_slots_for_user(user_id)
-        except Exception as e:
-            logger.warning(f"[API] Could not release slots for user {user_id}: {e}")
-
-        try:
+        def delete_student_auth():
+            if not auth_service.delete_student_by_email(email):
+                logger.info(f"[API] No student login removed for {email}")
+
+        # One transaction for the Postgres side when cascade_delete_user() is installed;
+        # the student login is removed separately either way
+        released_slot_ids = await asyncio.to_thread(user_service.delete_user_cascade, user_id, email)
+        if released_slot_ids is not None:
+            # The writes bypassed SlotService, so drop its cached copies here
+            for slot_id in released_slot_ids:
+                slot_service.invalidate_slot(slot_id)
+            slot_service.invalidate_available_slots()
             if email:
-                from app.api.main import admin_service  # type: ignore
+                try:
+                    await asyncio.to_thread(delete_student_auth)
+                except Exception as e:
+                    logger.warning(f"[API] Could not delete student auth for user {user_id}: {e}")
+            return {"success": True, "message": "User and associated data deleted successfully"}
 
-                admin_service.delete_student_account_by_email(email)
-        except Exception as e:
-            logger.warning(f"[API] Could not delete student auth for user {user_id}: {e}")
+        # Bookings and selected assignments made through select_slot are keyed by the student's
+        # auth id, not the enrolled id; resolve it before the login is deleted below
+        student = await asyncio.to_thread(auth_service.get_student_by_email, email) if email else None
+        owner_ids = [user_id] + ([student["id"]] if student else [])
+
+        bookings_per_owner = await asyncio.gather(
+            *(asyncio.to_thread(booking_service.get_bookings_by_user_id, owner_id) for owner_id in owner_ids)
+        )
+        bookings = [b for owner_bookings in bookings_per_owner for b in owner_bookings]
+        booking_tokens = list(dict.fromkeys(b.get("token") for b in bookings if b.get("token")))
+
+        def delete_transcripts():
+            from app.api.main import transcript_storage_service  # type: ignore
+
+            transcript_storage_service.delete_by_booking_tokens(booking_tokens)
+
+        def release_slots():
+            # Give back the seat of each selected slot, then drop the assignments
+            for owner_id in owner_ids:
+                for assignment in assignment_service.get_user_assignments(owner_id, status="selected"):
+                    slot_service.decrement_booking_count(assignment["slot_id"])
+                assignment_service.delete_assignments_by_user_id(owner_id)
+
+        # Best-effort cleanups touch independent tables/backends: run them together,
+        # and let one failure be logged without cancelling the others
+        cleanups = []
+        if booking_tokens:
+            cleanups.append(("delete transcripts", delete_transcripts))
+            cleanups.append((
+                "delete evaluations",
+                lambda: evaluation_service.delete_evaluations_by_booking_tokens(booking_tokens),
+            ))
+        cleanups.append(("release slots", release_slots))
+        if email:
+            cleanups.append(("delete student auth", delete_student_auth))
+
+        results = await asyncio.gather(
+            *(asyncio.to_thread(fn) for _, fn in cleanups),
+            return_exceptions=True,
+        )
+        for (label, _), result in zip(cleanups, results):
+            if isinstance(result, Exception):
+                logger.warning(f"[API] Could not {label} for user {user_id}: {result}")
 
         user_service.delete_user(user_id)
 
@@ -549,9 +656,7 @@ async def remove_student_auth_by_email(
                 detail="Email is required",
             )
 
-        from app.api.main import admin_service  # type: ignore
-
-        deleted_auth = admin_service.delete_student_account_by_email(email)
+        deleted_auth = await asyncio.to_thread(auth_service.delete_student_by_email, email)
 
         return {
             "success": True,
@@ -6,6 +6,7 @@ with proper validation and type safety.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from dataclasses import dataclass
 from pathlib import Path
@@ -13,18 +14,17 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 
-# Load environment variables from .env in backend directory (resolve to absolute path)
+# Load environment variables from the first env file found (resolve to absolute paths):
+# .env in backend directory, then .env.local in parent directory (for backward compatibility),
+# then .env in the current working directory. Parsed once per process, even if this module is reloaded.
 _backend_root = Path(__file__).resolve().parent.parent
 _env_path = _backend_root / ".env"
-if _env_path.exists():
-    load_dotenv(dotenv_path=str(_env_path))
-else:
-    # Fallback to .env.local in parent directory (for backward compatibility)
-    _env_path_fallback = _backend_root.parent / ".env.local"
-    if _env_path_fallback.exists():
-        load_dotenv(dotenv_path=str(_env_path_fallback))
-    # Also load from current working directory so "python backend_server.py" from backend root picks up .env
-    load_dotenv()
+if not globals().get("_DOTENV_LOADED"):
+    for _candidate in (_env_path, _backend_root.parent / ".env.local", Path.cwd() / ".env"):
+        if _candidate.exists():
+            load_dotenv(dotenv_path=str(_candidate))
+            break
+    _DOTENV_LOADED = True
 
 # Note: Google API key setup removed - using self-hosted OpenAI-compatible models only
 
@@ -122,6 +122,9 @@ class ServerConfig:
     frontend_url: str = ""
     # Public URL for links in emails (login, interview). Use e.g. https://interview.skillifire.com
     public_frontend_url: str = ""
+    # Auto-reload is for local development only; it forces a single worker
+    reload: bool = False
+    workers: int = 1
 
 
 @dataclass
@@ -318,6 +321,8 @@ class Config:
                 port=int(os.getenv("SERVER_PORT", "8000")),
                 frontend_url=os.getenv("NEXT_PUBLIC_APP_URL") or os.getenv("FRONTEND_URL", ""),
                 public_frontend_url=(os.getenv("PUBLIC_FRONTEND_URL") or os.getenv("FRONTEND_PUBLIC_URL") or "").strip(),
+                reload=os.getenv("SERVER_RELOAD", "false").lower() == "true",
+                workers=int(os.getenv("SERVER_WORKERS", "1")),
             ),
             api_key=APIKeyConfig(
                 key_hash=os.getenv("API_KEY_HASH"),
@@ -340,9 +345,13 @@ class Config:
 
 
 
+@lru_cache(maxsize=1)
 def get_config() -> Config:
     """
     Get configuration from environment variables.
+
+    Built once per process and shared by every caller; use get_config.cache_clear()
+    to re-read the environment (e.g. after changing it in a script).
     
     Returns:
         Configuration instance
@@ -11,14 +11,14 @@ from pydantic import BaseModel, Field
 
 class CreateSlotRequest(BaseModel):
     slot_datetime: str = Field(..., example="2026-02-15T10:00:00+05:30")  # ISO format datetime string
-    max_capacity: int = Field(default=30, example=10)  # Default 30, but admin can change
-    duration_minutes: int = Field(default=30, example=60)  # Interview duration in minutes (default 30)
+    max_capacity: int = Field(default=30, ge=1, example=10)  # Default 30, but admin can change
+    duration_minutes: int = Field(default=30, ge=1, le=120, example=60)  # Interview duration in minutes (default 30, max 2 hours)
     notes: Optional[str] = Field(None, example="Morning interview slot")
 
 
 class UpdateSlotRequest(BaseModel):
     slot_datetime: Optional[str] = Field(None, example="2026-02-15T11:00:00+05:30")
-    max_capacity: Optional[int] = Field(None, example=20)
+    max_capacity: Optional[int] = Field(None, ge=1, example=20)
     status: Optional[str] = Field(None, example="cancelled")
     notes: Optional[str] = Field(None, example="Rescheduled due to availability")
 
@@ -42,7 +42,7 @@ class CreateDaySlotsRequest(BaseModel):
     date: str = Field(..., example="2026-02-16")  # YYYY-MM-DD
     start_time: str = Field(..., example="09:00")  # HH:MM (24-hour)
     end_time: str = Field(..., example="17:00")  # HH:MM (24-hour)
-    interval_minutes: int = Field(default=30, example=60)
+    interval_minutes: int = Field(default=30, ge=5, example=60)
     duration_minutes: int = Field(default=30, example=45)
     max_capacity: int = Field(default=30, example=5)
     notes: Optional[str] = Field(None, example="Back-to-back testing slots")
@@ -10,11 +10,16 @@ import uuid
 from app.config import Config
 from app.db.supabase import get_supabase
 from app.utils.logger import get_logger
-from app.utils.exceptions import AgentError
+from app.utils.exceptions import AgentError, SlotUnavailableError
 from app.utils.datetime_utils import get_now_ist
 
 logger = get_logger(__name__)
 
+# PostgREST error code for "function not found" (docs/migration_finalize_slot_selection.sql not applied)
+_RPC_NOT_FOUND = "PGRST202"
+# Messages finalize_slot_selection() raises when the locked slot can no longer be booked
+_SLOT_UNAVAILABLE_MESSAGES = {"Slot is full", "Slot is not available"}
+
 
 class AssignmentService:
     """Service for managing user-slot assignments using Supabase"""
@@ -22,22 +27,30 @@ class AssignmentService:
     def __init__(self, config: Config):
         self.config = config
         self.client = get_supabase()
+        self._finalize_rpc_available = True
 
     def assign_slots_to_user(self, user_id: str, slot_ids: List[str]) -> List[Dict[str, Any]]:
+        return self.assign_slots_to_users([user_id], slot_ids)
+
+    def assign_slots_to_users(self, user_ids: List[str], slot_ids: List[str]) -> List[Dict[str, Any]]:
+        """Assign every slot to every user with a single insert."""
+        if not user_ids or not slot_ids:
+            return []
         try:
-            created = []
-            for slot_id in slot_ids:
-                assignment_data = {
+            assigned_at = get_now_ist().isoformat()
+            rows = [
+                {
                     "id": str(uuid.uuid4()),
                     "user_id": user_id,
                     "slot_id": slot_id,
                     "status": "assigned",
-                    "assigned_at": get_now_ist().isoformat(),
+                    "assigned_at": assigned_at,
                 }
-                response = self.client.table("assignments").insert(assignment_data).execute()
-                if response.data:
-                    created.append(response.data[0])
-            return created
+                for user_id in user_ids
+                for slot_id in slot_ids
+            ]
+            response = self.client.table("assignments").insert(rows).execute()
+            return response.data or []
         except Exception as e:
             logger.error(f"Error assigning slots: {e}")
             raise AgentError(f"Failed to assign slots: {str(e)}", "AssignmentService")
@@ -53,6 +66,20 @@ class AssignmentService:
             logger.error(f"Error fetching user assignments: {e}")
             return []
 
+    def get_user_assignment_for_slot(
+        self, user_id: str, slot_id: str, status: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return the user's assignment for a single slot, or None."""
+        try:
+            query = self.client.table("assignments").select("*").eq("user_id", user_id).eq("slot_id", slot_id)
+            if status:
+                query = query.eq("status", status)
+            response = query.limit(1).execute()
+            return response.data[0] if response.data else None
+        except Exception as e:
+            logger.error(f"Error fetching user assignment for slot: {e}")
+            return None
+
     def select_slot_for_user(self, user_id: str, assignment_id: str) -> bool:
         try:
             response = self.client.table("assignments").update({
@@ -65,6 +92,44 @@ class AssignmentService:
             logger.error(f"Error selecting slot: {e}")
             return False
 
+    def finalize_slot_selection(
+        self,
+        user_id: str,
+        email: str,
+        assignment_id: str,
+        slot_id: str,
+        booking: Dict[str, Any],
+    ) -> bool:
+        """
+        Book the slot in one database transaction: re-check it under a row lock, insert the
+        booking (a BookingService.build_booking row), select the assignment, cancel the user's
+        other ones, count the booking and set the enrolled user's interview_status (by email).
+
+        user_id is the auth users.id. Raises SlotUnavailableError if the slot filled up or was
+        closed meanwhile. Returns False when the finalize_slot_selection() database function
+        is not installed, so the caller can fall back to the individual writes.
+        """
+        if not self._finalize_rpc_available:
+            return False
+        try:
+            self.client.rpc("finalize_slot_selection", {
+                "p_user_id": user_id,
+                "p_email": email,
+                "p_assignment_id": assignment_id,
+                "p_slot_id": slot_id,
+                "p_booking": booking,
+            }).execute()
+            return True
+        except Exception as e:
+            if getattr(e, "message", None) in _SLOT_UNAVAILABLE_MESSAGES:
+                raise SlotUnavailableError(e.message)
+            if getattr(e, "code", None) == _RPC_NOT_FOUND:
+                logger.warning("[AssignmentService] finalize_slot_selection() not installed; using separate updates")
+                self._finalize_rpc_available = False
+                return False
+            logger.error(f"Error finalizing slot selection: {e}")
+            raise AgentError(f"Failed to finalize slot selection: {str(e)}", "AssignmentService")
+
     def cancel_other_assignments(self, user_id: str, selected_assignment_id: str) -> bool:
         try:
             response = self.client.table("assignments").update({
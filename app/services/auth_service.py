@@ -5,7 +5,7 @@ Handles JWT-based authentication for both admin, manager, and student users.
 """
 
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple
 from datetime import timedelta
 import jwt
 import bcrypt
@@ -246,6 +246,81 @@ class AuthService:
                  raise AgentError("Email already registered", "auth")
             raise AgentError(f"Failed to create student user: {str(e)}", "auth")
 
+    def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Return which of the given emails already have an account, in a single query."""
+        unique = list(set(emails))
+        if not unique:
+            return set()
+        try:
+            res = self.client.table("users").select("email").in_("email", unique).execute()
+            return {row["email"] for row in (res.data or [])}
+        except Exception as e:
+            logger.error(f"[AuthService] Failed to check existing students: {str(e)}", exc_info=True)
+            raise AgentError(f"Failed to create student user: {str(e)}", "auth")
+
+    def register_students_bulk(
+        self, students: List[Dict[str, Any]], existing_emails: Optional[Set[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Register many students with one existence check and one insert.
+
+        Each entry takes the register_student arguments (email, password, name, phone,
+        must_change_password). Returns (created rows, {email: error message}) so callers can
+        report failures per row. Pass existing_emails when the caller already ran
+        get_existing_emails to skip a second lookup. If the bulk insert fails (e.g. a
+        concurrent registration), falls back to register_student for each remaining entry.
+        """
+        if not students:
+            return [], {}
+        errors: Dict[str, str] = {}
+        if existing_emails is None:
+            existing_emails = self.get_existing_emails(s["email"] for s in students)
+        taken = set(existing_emails)
+
+        now_iso = get_now_ist().isoformat()
+        pending = []
+        rows = []
+        for student in students:
+            email = student["email"]
+            if email in taken:
+                errors[email] = "Email already registered"
+                continue
+            taken.add(email)  # later duplicates in the same batch count as registered
+            pending.append(student)
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "email": email,
+                "password_hash": self.hash_password(student["password"]),
+                "name": student["name"],
+                "phone": student.get("phone"),
+                "role": "student",
+                "must_change_password": student.get("must_change_password", False),
+                "created_at": now_iso,
+            })
+        if not rows:
+            return [], errors
+
+        try:
+            self.client.table("users").insert(rows).execute()
+            logger.info(f"[AuthService] ✅ Created {len(rows)} student users")
+            return rows, errors
+        except Exception as e:
+            logger.warning(f"[AuthService] Bulk student insert failed, registering one by one: {str(e)}")
+
+        created = []
+        for student in pending:
+            try:
+                created.append(self.register_student(
+                    email=student["email"],
+                    password=student["password"],
+                    name=student["name"],
+                    phone=student.get("phone"),
+                    must_change_password=student.get("must_change_password", False),
+                ))
+            except AgentError as e:
+                errors[student["email"]] = e.message
+        return created, errors
+
     def register_manager(self, name: str, email: str) -> Dict[str, Any]:
         """Enroll a manager. Generates a temp password."""
         try:
@@ -309,6 +384,20 @@ class AuthService:
             logger.error(f"[AuthService] Failed to delete student: {str(e)}", exc_info=True)
             return False
 
+    def delete_students_by_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Delete the student users with the given emails in one query; returns the emails deleted."""
+        emails = list(emails)
+        if not emails:
+            return set()
+        try:
+            r = self.client.table("users").delete().in_("email", emails).eq("role", "student").execute()
+            deleted = {row["email"] for row in (r.data or [])}
+            logger.info(f"[AuthService] ✅ Deleted {len(deleted)} student accounts")
+            return deleted
+        except Exception as e:
+            logger.error(f"[AuthService] Failed to delete students: {str(e)}", exc_info=True)
+            return set()
+
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         try:
             response = self.client.table("users").select("*").eq("email", email).execute()
@@ -332,6 +421,8 @@ class AuthService:
                 # Not a valid UUID, likely a legacy Mongo ID
                 return None
 
+            # Not cached: this row backs every authorization decision (get_current_user), so a
+            # deleted, demoted or re-passworded user must lose access on every worker at once
             response = self.client.table("users").select("*").eq("id", user_id).execute()
             if not response.data:
                 return None
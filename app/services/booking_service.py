@@ -42,27 +42,58 @@ class BookingService:
         prompt: Optional[str] = None,  # NEW: Per-interview prompt
     ) -> str:
         """Create a new interview booking in Supabase."""
+        return self.insert_booking(self.build_booking(
+            name=name,
+            email=email,
+            scheduled_at=scheduled_at,
+            phone=phone,
+            application_text=application_text,
+            application_url=application_url,
+            slot_id=slot_id,
+            user_id=user_id,
+            assignment_id=assignment_id,
+            application_form_id=application_form_id,
+            prompt=prompt,
+        ))
+
+    def build_booking(
+        self,
+        name: str,
+        email: str,
+        scheduled_at: datetime,
+        phone: Optional[str] = None,
+        application_text: Optional[str] = None,
+        application_url: Optional[str] = None,
+        slot_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        application_form_id: Optional[str] = None,
+        prompt: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Build a new interview_bookings row (with a fresh token) without inserting it."""
+        return {
+            "id": str(uuid.uuid4()),
+            "token": "".join(random.choices(string.ascii_letters + string.digits, k=32)),
+            "name": name,
+            "email": email,
+            "phone": phone,
+            "scheduled_at": scheduled_at.isoformat(),
+            "application_text": application_text,
+            "application_url": application_url,
+            "prompt": prompt,  # NEW
+            "slot_id": slot_id,
+            "user_id": user_id,
+            "assignment_id": assignment_id,
+            "application_form_id": application_form_id,
+            "status": "scheduled",
+            "created_at": get_now_ist().isoformat(),
+        }
+
+    def insert_booking(self, booking_data: Dict[str, Any]) -> str:
+        """Insert a row from build_booking. Returns its token."""
         try:
-            token = "".join(random.choices(string.ascii_letters + string.digits, k=32))
-            booking_data = {
-                "id": str(uuid.uuid4()),
-                "token": token,
-                "name": name,
-                "email": email,
-                "phone": phone,
-                "scheduled_at": scheduled_at.isoformat(),
-                "application_text": application_text,
-                "application_url": application_url,
-                "prompt": prompt,  # NEW
-                "slot_id": slot_id,
-                "user_id": user_id,
-                "assignment_id": assignment_id,
-                "application_form_id": application_form_id,
-                "status": "scheduled",
-                "created_at": get_now_ist().isoformat(),
-            }
             self.client.table("interview_bookings").insert(booking_data).execute()
-            return token
+            return booking_data["token"]
         except Exception as e:
             logger.error(f"Error creating booking: {e}")
             raise AgentError(f"Failed to create booking: {str(e)}", "BookingService")
@@ -132,6 +163,17 @@ class BookingService:
             logger.error(f"Error updating booking: {e}")
             return False
 
+    def bulk_update_user_id(self, tokens: List[str], user_id: str) -> bool:
+        """Set user_id on all bookings with the given tokens in a single update."""
+        if not tokens:
+            return True
+        try:
+            response = self.client.table("interview_bookings").update({"user_id": user_id}).in_("token", tokens).execute()
+            return bool(response.data)
+        except Exception as e:
+            logger.error(f"Error bulk updating booking user_id: {e}")
+            return False
+
     def get_bookings_by_email(self, email: str) -> List[Dict[str, Any]]:
         """Get bookings matching email (case-insensitive)."""
         try:
@@ -141,6 +183,29 @@ class BookingService:
             logger.error(f"Error fetching bookings by email: {e}")
             return []
 
+    def get_bookings_by_email_or_user_ids(self, email: str, user_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get bookings matching email (case-insensitive) or any of user_ids, in a single query.
+
+        Rows are distinct and ordered by scheduled_at (timestamptz, so the order is
+        correct whatever offset each value was stored with).
+        """
+        filters = [f'email.ilike."{email}"']
+        ids = [uid for uid in user_ids if uid]
+        if ids:
+            filters.append(f"user_id.in.({','.join(ids)})")
+        try:
+            response = (
+                self.client.table("interview_bookings")
+                .select("*")
+                .or_(",".join(filters))
+                .order("scheduled_at", desc=False)
+                .execute()
+            )
+            return [self._normalize_booking(b) for b in (response.data or [])]
+        except Exception as e:
+            logger.error(f"Error fetching bookings by email or user_id: {e}")
+            return []
+
     def get_bookings_by_user_id(self, user_id: str) -> List[Dict[str, Any]]:
         """Get bookings for a user_id."""
         try:
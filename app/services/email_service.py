@@ -6,6 +6,7 @@ Handles sending interview confirmation emails via SMTP.
 
 from datetime import datetime
 from typing import Optional, Tuple
+import asyncio
 import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -15,6 +16,10 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Upper bound on simultaneous SMTP sessions per process; bulk enrollment queues one email
+# per row, and opening them all at once gets throttled or refused by the provider
+_MAX_CONCURRENT_SENDS = 10
+
 
 class EmailService:
     """Service for sending emails"""
@@ -26,6 +31,22 @@ class EmailService:
             config.smtp.user and
             config.smtp.password
         )
+        self._send_slots = asyncio.Semaphore(_MAX_CONCURRENT_SENDS)
+
+    async def _send(self, message: MIMEMultipart) -> None:
+        """Send one message over SMTP, waiting for a free slot when too many are in flight."""
+        # SMTP_SECURE=true means direct TLS (port 465), false means STARTTLS (port 587)
+        async with self._send_slots:
+            await aiosmtplib.send(
+                message,
+                hostname=self.config.smtp.host,
+                port=self.config.smtp.port,
+                use_tls=self.config.smtp.secure,
+                start_tls=not self.config.smtp.secure,
+                username=self.config.smtp.user,
+                password=self.config.smtp.password,
+                timeout=30.0,  # Increased timeout to 30 seconds
+            )
     
     async def send_interview_email(
         self,
@@ -72,20 +93,7 @@ class EmailService:
             # Send email
             # For port 587: use STARTTLS (connect plain, then upgrade to TLS)
             # For port 465: use direct TLS/SSL connection
-            # SMTP_SECURE=true means use direct TLS (port 465), false means use STARTTLS (port 587)
-            use_tls = self.config.smtp.secure  # Direct TLS for port 465
-            start_tls = not self.config.smtp.secure  # STARTTLS for port 587
-            
-            await aiosmtplib.send(
-                message,
-                hostname=self.config.smtp.host,
-                port=self.config.smtp.port,
-                use_tls=use_tls,
-                start_tls=start_tls,
-                username=self.config.smtp.user,
-                password=self.config.smtp.password,
-                timeout=30.0,  # Increased timeout to 30 seconds
-            )
+            await self._send(message)
             
             logger.info(f"[EmailService] ✅ Email sent successfully to {to_email}")
             return True, None
@@ -135,21 +143,9 @@ class EmailService:
             message.attach(html_part)
             
             # Send email
-            use_tls = self.config.smtp.secure
-            start_tls = not self.config.smtp.secure
-            
             logger.info(f"[EmailService] 📧 Connecting to SMTP server...")
             
-            await aiosmtplib.send(
-                message,
-                hostname=self.config.smtp.host,
-                port=self.config.smtp.port,
-                use_tls=use_tls,
-                start_tls=start_tls,
-                username=self.config.smtp.user,
-                password=self.config.smtp.password,
-                timeout=30.0,  # Increased timeout to 30 seconds
-            )
+            await self._send(message)
             
             logger.info(f"[EmailService] ✅ Enrollment email sent successfully to {to_email}")
             return True, None
@@ -9,6 +9,7 @@ import json
 import re
 import asyncio
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from decimal import Decimal
@@ -27,6 +28,15 @@ except ImportError:
     HTTPX_AVAILABLE = False
     logger.warning("httpx not available - AI evaluation will use fallback mode")
 
+# Gemini analysis called from inside a running event loop gets its own loop on one of these
+# threads. Shared for the process instead of spinning up a pool per evaluation.
+_ANALYSIS_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="eval-analysis")
+
+
+def shutdown_analysis_executor() -> None:
+    """Stop the shared analysis pool (called on app shutdown)."""
+    _ANALYSIS_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+
 
 class EvaluationService:
     """
@@ -963,7 +973,6 @@ Provide JSON:
                         loop = asyncio.get_event_loop()
                         if loop.is_running():
                             logger.info("🔄 [EVAL-DEBUG] Loop is running, using ThreadPoolExecutor...")
-                            import concurrent.futures
                             
                             def run_async():
                                 logger.info("🔄 [EVAL-DEBUG] Creating new event loop in thread...")
@@ -979,12 +988,11 @@ Provide JSON:
                                 finally:
                                     new_loop.close()
                             
-                            with concurrent.futures.ThreadPoolExecutor() as executor:
-                                logger.info("⏳ [EVAL-DEBUG] Submitting async task to executor...")
-                                future = executor.submit(run_async)
-                                logger.info("⏳ [EVAL-DEBUG] Waiting for AI analysis result (timeout: 90s)...")
-                                ai_analysis = future.result(timeout=90)
-                                logger.info(f"✅ [EVAL-DEBUG] AI analysis completed: {ai_analysis is not None}")
+                            logger.info("⏳ [EVAL-DEBUG] Submitting async task to executor...")
+                            future = _ANALYSIS_EXECUTOR.submit(run_async)
+                            logger.info("⏳ [EVAL-DEBUG] Waiting for AI analysis result (timeout: 90s)...")
+                            ai_analysis = future.result(timeout=90)
+                            logger.info(f"✅ [EVAL-DEBUG] AI analysis completed: {ai_analysis is not None}")
                         else:
                             logger.info("🔄 [EVAL-DEBUG] Loop not running, using run_until_complete...")
                             ai_analysis = loop.run_until_complete(
@@ -1235,15 +1243,13 @@ Provide JSON:
                     # Run async analysis
                     loop = asyncio.get_event_loop()
                     if loop.is_running():
-                        import concurrent.futures
                         def run_sync():
                             new_loop = asyncio.new_event_loop()
                             try:
                                 return new_loop.run_until_complete(self._generate_overall_analysis_with_gemini(evaluations))
                             finally:
                                 new_loop.close()
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            result["overall_analysis"] = executor.submit(run_sync).result(timeout=45)
+                        result["overall_analysis"] = _ANALYSIS_EXECUTOR.submit(run_sync).result(timeout=45)
                     else:
                         result["overall_analysis"] = loop.run_until_complete(self._generate_overall_analysis_with_gemini(evaluations))
                 except Exception as e:
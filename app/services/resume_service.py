@@ -4,12 +4,22 @@ Application Processing Service
 Handles application file upload, text extraction, and storage.
 """
 
+import hashlib
 import re
+import threading
+from functools import lru_cache
 from io import BytesIO
 from typing import Optional, Tuple, Dict, Any, List
 from pathlib import Path
 from datetime import datetime
 
+from cachetools import TTLCache
+
+try:
+    import pymupdf  # optional (requirements-pdf.txt, AGPL); much faster PDF text extraction than PyPDF2
+except ImportError:
+    pymupdf = None
+
 try:
     from PyPDF2 import PdfReader
 except ImportError:
@@ -26,6 +36,10 @@ from app.utils.exceptions import AgentError
 
 logger = get_logger(__name__)
 
+# Retried/duplicate uploads of the same file reuse the extracted text instead of re-parsing it
+_EXTRACT_CACHE_TTL = 60 * 60  # seconds
+_EXTRACT_CACHE_SIZE = 256
+
 # Labels that start the *next* field in application forms. Used to stop capture so we don't merge fields.
 _NEXT_FIELD_LABELS = (
     "Post", "Category", "Date of Birth", "DOB", "D.O.B", "Age completed", "Age as on",
@@ -48,6 +62,28 @@ _SECTION_HEADERS = (
     ("other", re.compile(r"Other\s+Details?|Declaration|Preference|Exam\s+Center|State\s+Applying|Interests|Hobbies", re.IGNORECASE)),
 )
 
+# Date normalization: ISO dates are returned as-is; others are tried against these formats in order
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_DATE_FORMATS = ("%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d", "%d-%m-%y", "%d/%m/%y")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_date_str(raw: str) -> str:
+    """Normalize a stripped date string to YYYY-MM-DD, or return it unchanged if no format matches."""
+    head = raw[:10]
+    if _ISO_DATE_RE.match(head):
+        try:
+            return datetime.fromisoformat(head).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(head, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return raw
+
+
 # Comprehensive list of technical skills for dictionary matching
 _SKILL_KEYWORDS = [
     "Python", "Java", "JavaScript", "TypeScript", "HTML", "CSS", "React", "Vue", "Angular",
@@ -73,9 +109,21 @@ class ResumeService:
         'application/msword',
         'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
     }
+    # Signature expected for each allowed extension and how many leading bytes it may lie
+    # within (DOCX is a zip, DOC is an OLE2 container). PDF readers accept the %PDF- header
+    # anywhere in the first 1024 bytes, e.g. after a BOM or junk bytes.
+    FILE_SIGNATURES = {
+        '.pdf': (b'%PDF-', 1024),
+        '.docx': (b'PK\x03\x04', 4),
+        '.doc': (b'\xd0\xcf\x11\xe0', 4),
+    }
     
     def __init__(self, config: Config):
         self.config = config
+        self._extract_cache: TTLCache = TTLCache(
+            maxsize=_EXTRACT_CACHE_SIZE, ttl=_EXTRACT_CACHE_TTL
+        )
+        self._cache_lock = threading.Lock()
         
     def validate_file(self, file_content: bytes, filename: str, content_type: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """
@@ -93,6 +141,24 @@ class ResumeService:
         if len(file_content) > self.MAX_FILE_SIZE:
             return False, f"File size exceeds maximum of {self.MAX_FILE_SIZE / 1024 / 1024}MB"
         
+        is_valid, error_msg = self.validate_file_type(filename, content_type)
+        if not is_valid:
+            return is_valid, error_msg
+        
+        # Check the content actually starts like the claimed format
+        expected = self.FILE_SIGNATURES.get(Path(filename).suffix.lower())
+        if expected and expected[0] not in file_content[:expected[1]]:
+            return False, "File content does not match its extension. Expected a valid PDF, DOC, or DOCX file"
+        
+        return True, None
+    
+    def validate_file_type(self, filename: str, content_type: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Validate extension and MIME type only, so uploads can be rejected before the body is read.
+        
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
         # Check extension
         file_ext = Path(filename).suffix.lower()
         if file_ext not in self.ALLOWED_EXTENSIONS:
@@ -104,7 +170,18 @@ class ResumeService:
         
         return True, None
     
-    def extract_text(self, file_content: bytes, filename: str, content_type: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    @staticmethod
+    def content_hasher():
+        """New hash object for upload content; its hexdigest is what extract_text keys its cache on."""
+        return hashlib.blake2b(digest_size=16)
+
+    def extract_text(
+        self,
+        file_content: bytes,
+        filename: str,
+        content_type: Optional[str] = None,
+        content_digest: Optional[str] = None,
+    ) -> Tuple[str, Optional[str]]:
         """
         Extract text from application file.
         
@@ -112,40 +189,62 @@ class ResumeService:
             file_content: File content as bytes
             filename: Original filename
             content_type: MIME type of file
+            content_digest: content_hasher() hexdigest of file_content, if the caller
+                already computed it while reading; hashed here otherwise
             
         Returns:
             Tuple of (extracted_text, error_message)
         """
         file_ext = Path(filename).suffix.lower()
+        if content_digest is None:
+            hasher = self.content_hasher()
+            hasher.update(file_content)
+            content_digest = hasher.hexdigest()
+        cache_key = (content_digest, file_ext)
+        with self._cache_lock:
+            cached = self._extract_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"[ResumeService] Reusing extracted text for identical upload ({len(cached)} characters)")
+            return cached, None
         
         try:
             if file_ext == '.pdf':
-                return self._extract_pdf_text(file_content)
+                text, error = self._extract_pdf_text(file_content)
             elif file_ext in ['.doc', '.docx']:
-                return self._extract_docx_text(file_content)
+                text, error = self._extract_docx_text(file_content)
             else:
                 return "", f"Unsupported file type: {file_ext}"
+            # Only successful extractions are cached
+            if text and error is None:
+                with self._cache_lock:
+                    self._extract_cache[cache_key] = text
+            return text, error
         except Exception as e:
             error_msg = f"Failed to extract text: {str(e)}"
             logger.error(f"[ResumeService] {error_msg}", exc_info=True)
             return "", error_msg
     
     def _extract_pdf_text(self, file_content: bytes) -> Tuple[str, Optional[str]]:
-        """Extract text from PDF file"""
-        if PdfReader is None:
+        """Extract text from PDF file (PyMuPDF when installed, otherwise PyPDF2)"""
+        if pymupdf is None and PdfReader is None:
             return "", "PyPDF2 library not installed"
         
         try:
-            pdf_file = BytesIO(file_content)
-            reader = PdfReader(pdf_file)
-            
             text_parts = []
-            num_pages = len(reader.pages)
-            
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
+            if pymupdf is not None:
+                with pymupdf.open(stream=file_content, filetype="pdf") as doc:
+                    num_pages = doc.page_count
+                    for page in doc:
+                        text = page.get_text("text")
+                        if text:
+                            text_parts.append(text)
+            else:
+                reader = PdfReader(BytesIO(file_content))
+                num_pages = len(reader.pages)
+                for page in reader.pages:
+                    text = page.extract_text()
+                    if text:
+                        text_parts.append(text)
             
             full_text = '\n'.join(text_parts)
             
@@ -385,14 +484,7 @@ class ResumeService:
         """Normalize date string to YYYY-MM-DD. Accepts dd-mm-yyyy, dd/mm/yyyy, yyyy-mm-dd."""
         if not raw or not raw.strip():
             return None
-        raw = raw.strip()
-        for fmt in ("%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d", "%d-%m-%y", "%d/%m/%y"):
-            try:
-                dt = datetime.strptime(raw[:10], fmt)
-                return dt.strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-        return raw
+        return _normalize_date_str(raw.strip())
 
     def _chunk_by_sections(self, text: str) -> Dict[str, str]:
         """
@@ -4,18 +4,33 @@ Slot Service
 Handles interview slot management with Supabase.
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta
+import threading
 import uuid
 
+from cachetools import TTLCache
+
 from app.config import Config
 from app.db.supabase import get_supabase
 from app.utils.logger import get_logger
-from app.utils.exceptions import AgentError
-from app.utils.datetime_utils import get_now_ist, to_ist, parse_datetime_safe
+from app.utils.exceptions import AgentError, DuplicateSlotError
+from app.utils.datetime_utils import get_now_ist, to_ist, parse_datetime_safe, parse_iso_to_ist
 
 logger = get_logger(__name__)
 
+# The student availability list is read on every page load; writes through this service invalidate it
+_AVAILABLE_SLOTS_CACHE_TTL = 20  # seconds
+_AVAILABLE_SLOTS_KEY = "available"
+# Single-slot display reads (get_slot / get_slots_by_ids). Other workers' writes cannot clear
+# it, so booking and capacity checks bypass it with use_cache=False.
+_SLOT_CACHE_TTL = 20  # seconds
+_SLOT_CACHE_SIZE = 1024
+# Postgres unique_violation: another slot already holds the slot_datetime
+_UNIQUE_VIOLATION = "23505"
+
 
 class SlotService:
     """Service for managing interview slots using Supabase"""
@@ -23,6 +38,20 @@ class SlotService:
     def __init__(self, config: Config):
         self.config = config
         self.client = get_supabase()
+        self._available_cache: TTLCache = TTLCache(maxsize=1, ttl=_AVAILABLE_SLOTS_CACHE_TTL)
+        self._slot_cache: TTLCache = TTLCache(maxsize=_SLOT_CACHE_SIZE, ttl=_SLOT_CACHE_TTL)
+        self._cache_lock = threading.Lock()
+
+    def invalidate_available_slots(self) -> None:
+        """Drop the cached available-slots list after any slot write."""
+        with self._cache_lock:
+            self._available_cache.clear()
+
+    def invalidate_slot(self, slot_id: str) -> None:
+        """Drop one slot's cached row along with the available-slots list after a write to it."""
+        with self._cache_lock:
+            self._slot_cache.pop(slot_id, None)
+        self.invalidate_available_slots()
 
     def _map_to_frontend(self, slot: Dict[str, Any]) -> Dict[str, Any]:
         """Map DB columns to frontend expected fields."""
@@ -63,6 +92,8 @@ class SlotService:
                     if isinstance(dt_str, str):
                         dt = parse_datetime_safe(dt_str)
                         slot[field] = dt.isoformat()
+                    elif isinstance(dt_str, datetime):
+                        slot[field] = to_ist(dt_str).isoformat()
                 except (ValueError, TypeError):
                     logger.warning(f"Failed to convert field {field} to IST: {slot[field]}")
 
@@ -81,6 +112,28 @@ class SlotService:
 
         return slot
 
+    def _build_slot_row(
+        self,
+        start_time_ist: datetime,
+        duration_minutes: int,
+        capacity: int,
+        notes: Optional[str],
+        now_iso: str,
+    ) -> Dict[str, Any]:
+        """Build a slots row using DB column names."""
+        # REMOVED: start_time, end_time (not in Supabase schema)
+        return {
+            "id": str(uuid.uuid4()),
+            "slot_datetime": start_time_ist.isoformat(),
+            "duration_minutes": duration_minutes,
+            "capacity": capacity,         # DB column: capacity
+            "booked_count": 0,            # DB column: booked_count
+            "status": "active",
+            "notes": notes,
+            "created_at": now_iso,
+            "updated_at": now_iso,
+        }
+
     def create_slot(
         self,
         start_time: datetime,
@@ -95,52 +148,98 @@ class SlotService:
             if duration_minutes is None:
                 duration_minutes = int((end_time_ist - start_time_ist).total_seconds() / 60)
             
-            now_iso = get_now_ist().isoformat()
+            slot_data_db = self._build_slot_row(
+                start_time_ist, duration_minutes, max_bookings, notes, get_now_ist().isoformat()
+            )
             
-            # Use DB column names for insert
-            # REMOVED: start_time, end_time (not in Supabase schema)
-            slot_data_db = {
-                "id": str(uuid.uuid4()),
-                "slot_datetime": start_time_ist.isoformat(),
-                "duration_minutes": duration_minutes,
-                "capacity": max_bookings,     # DB column: capacity
-                "booked_count": 0,            # DB column: booked_count
-                "status": "active",
-                "notes": notes,
-                "created_at": now_iso,
-                "updated_at": now_iso,
-            }
-            
-            response = self.client.table("slots").insert(slot_data_db).execute()
-            created_slot = response.data[0] if response.data else slot_data_db
+            # INSERT ... ON CONFLICT (slot_datetime) DO NOTHING: relies on the unique index from
+            # docs/migration_slots_unique_datetime.sql; an empty result means the slot already exists.
+            response = self.client.table("slots").upsert(
+                slot_data_db, on_conflict="slot_datetime", ignore_duplicates=True
+            ).execute()
+            if not response.data:
+                raise DuplicateSlotError()
+            created_slot = response.data[0]
+            self.invalidate_available_slots()
             
-            logger.info(f"[SlotService] Slot created: id={created_slot.get('id')}")
+            logger.info("[SlotService] Slot created: id=%s", created_slot.get('id'))
             return self._map_to_frontend(created_slot)
             
+        except DuplicateSlotError:
+            raise
         except Exception as e:
             logger.error(f"Error creating slot: {e}")
             raise AgentError(f"Failed to create slot: {str(e)}", "SlotService")
 
-    def get_slot_by_datetime(self, slot_datetime_iso: str) -> Optional[Dict[str, Any]]:
-        """Return an existing slot with the same slot_datetime (avoid duplicates)."""
+    def get_slot(self, slot_id: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one slot. Cached copies are per process and may be up to _SLOT_CACHE_TTL seconds
+        stale when another worker wrote the slot, so pass use_cache=False for booking and
+        capacity decisions; the cache is only for display reads.
+        """
+        if use_cache:
+            with self._cache_lock:
+                cached = self._slot_cache.get(slot_id)
+            if cached is not None:
+                return dict(cached)
         try:
-            response = self.client.table("slots").select("*").eq("slot_datetime", slot_datetime_iso).execute()
+            response = self.client.table("slots").select("*").eq("id", slot_id).execute()
             if not response.data:
                 return None
-            return self._map_to_frontend(response.data[0])
+            slot = self._map_to_frontend(response.data[0])
+            with self._cache_lock:
+                self._slot_cache[slot_id] = slot
+            return dict(slot)
         except Exception as e:
-            logger.error(f"Error finding slot by datetime: {e}")
+            logger.error(f"Error fetching slot: {e}")
             return None
 
-    def get_slot(self, slot_id: str) -> Optional[Dict[str, Any]]:
+    def get_slots_by_ids(self, slot_ids: List[str], use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Return slots for the given ids, keyed by slot id; cache misses are fetched in a single query.
+        Pass use_cache=False to read every slot fresh (see get_slot).
+        """
+        if not slot_ids:
+            return {}
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        with self._cache_lock:
+            for slot_id in slot_ids:
+                cached = self._slot_cache.get(slot_id) if use_cache else None
+                if cached is not None:
+                    found[slot_id] = dict(cached)
+                else:
+                    missing.append(slot_id)
+        if not missing:
+            return found
         try:
-            response = self.client.table("slots").select("*").eq("id", slot_id).execute()
-            if not response.data:
-                return None
-            return self._map_to_frontend(response.data[0])
+            response = self.client.table("slots").select("*").in_("id", missing).execute()
+            fetched = {row["id"]: self._map_to_frontend(row) for row in (response.data or [])}
         except Exception as e:
-            logger.error(f"Error fetching slot: {e}")
-            return None
+            logger.error(f"Error fetching slots: {e}")
+            return found
+        with self._cache_lock:
+            self._slot_cache.update(fetched)
+        found.update((slot_id, dict(slot)) for slot_id, slot in fetched.items())
+        return found
+
+    def _slots_query(self, status: Optional[str], include_past: bool):
+        query = self.client.table("slots").select("*")
+
+        if status:
+            query = query.eq("status", status)
+
+        if not include_past:
+            from datetime import timezone
+            now = datetime.now(timezone.utc).isoformat()
+            query = query.gte("slot_datetime", now)
+
+        return query.order("slot_datetime", desc=False)
+
+    def _fetch_slots(self, status: Optional[str], include_past: bool) -> List[Dict[str, Any]]:
+        """Fetch slots in get_all_slots order; raises on failure instead of returning []."""
+        response = self._slots_query(status, include_past).execute()
+        return [self._map_to_frontend(slot) for slot in (response.data or [])]
 
     def get_all_slots(
         self,
@@ -148,29 +247,103 @@ class SlotService:
         include_past: bool = False,
     ) -> List[Dict[str, Any]]:
         try:
-            query = self.client.table("slots").select("*")
-            
-            if status:
-                query = query.eq("status", status)
-            
-            if not include_past:
-                from datetime import timezone
-                now = datetime.now(timezone.utc).isoformat()
-                query = query.gte("slot_datetime", now)
-            
-            query = query.order("slot_datetime", desc=False)
-            response = query.execute()
-            
-            slots = []
-            for slot in (response.data or []):
-                slots.append(self._map_to_frontend(slot))
-            return slots
+            return self._fetch_slots(status, include_past)
         except Exception as e:
             logger.error(f"Error fetching slots: {e}")
             return []
 
+    def get_slots_page(
+        self,
+        after: Optional[Tuple[str, str]],
+        limit: int,
+        status: Optional[str] = None,
+        include_past: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """Fetch one page of slots in get_all_slots order, starting after a keyset cursor.
+
+        Returns (slots, cursor for the next page); the cursor is None on the last page.
+        Paging by (slot_datetime, id) rather than offset means rows inserted or deleted
+        between pages cannot shift later pages into skipping or repeating rows. Unlike
+        get_all_slots this raises on failure, so a paginated reader can tell an error apart
+        from the end of the list.
+        """
+        try:
+            # id breaks ties between slots at the same datetime so the order is total
+            query = self._slots_query(status, include_past).order("id", desc=False)
+            if after is not None:
+                after_datetime, after_id = after
+                query = query.or_(
+                    f'slot_datetime.gt."{after_datetime}",'
+                    f'and(slot_datetime.eq."{after_datetime}",id.gt.{after_id})'
+                )
+            rows = query.limit(limit).execute().data or []
+            cursor = (rows[-1]["slot_datetime"], rows[-1]["id"]) if len(rows) == limit else None
+            return [self._map_to_frontend(slot) for slot in rows], cursor
+        except Exception as e:
+            logger.error(f"Error fetching slots page after {after}: {e}")
+            raise AgentError(f"Failed to fetch slots: {str(e)}", "SlotService")
+
+    @staticmethod
+    def _parse_start(slot: Dict[str, Any]) -> Optional[datetime]:
+        try:
+            return parse_iso_to_ist(slot["slot_datetime"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _cached_available_slots(
+        self,
+    ) -> Tuple[List[Dict[str, Any]], List[datetime], List[Dict[str, Any]]]:
+        """
+        Shared cached view of active upcoming slots; callers must not mutate it.
+
+        Returns (slots, starts, dated_slots): slots in query order, plus the slots whose
+        start parsed (parsed once, when the list is fetched) sorted by start, with
+        starts[i] the start of dated_slots[i] so time windows can be bisected. Raises
+        AgentError when the fetch fails, so a transient error is never cached as "no slots".
+        """
+        with self._cache_lock:
+            cached = self._available_cache.get(_AVAILABLE_SLOTS_KEY)
+        if cached is None:
+            try:
+                slots = self._fetch_slots("active", False)
+            except Exception as e:
+                logger.error(f"Error fetching available slots: {e}")
+                raise AgentError(f"Failed to fetch slots: {str(e)}", "SlotService")
+            dated = sorted(
+                ((start, slot) for slot in slots if (start := self._parse_start(slot)) is not None),
+                key=itemgetter(0),
+            )
+            cached = (slots, [start for start, _ in dated], [slot for _, slot in dated])
+            with self._cache_lock:
+                self._available_cache[_AVAILABLE_SLOTS_KEY] = cached
+        return cached
+
     def get_available_slots(self) -> List[Dict[str, Any]]:
-        return self.get_all_slots(status="active")
+        slots, _, _ = self._cached_available_slots()
+        # Callers get their own copies so the cached rows stay untouched
+        return [dict(slot) for slot in slots]
+
+    def get_auto_assign_slot_ids(
+        self, within: timedelta = timedelta(days=2), now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Ids of active slots starting between now and now + within that still have room.
+
+        Enrollment auto-assigns these. Served from the available-slots cache, which every
+        slot write through this service invalidates, so enrollment bursts reuse one fetch.
+        Pass now to share a single reference time with the caller's own checks.
+        """
+        if now is None:
+            now = get_now_ist()
+        _, starts, dated_slots = self._cached_available_slots()
+        # Starts are sorted: bisect to the [now, now + within] window, then check capacity there only
+        lo = bisect_left(starts, now)
+        hi = bisect_right(starts, now + within, lo=lo)
+        return [
+            slot["id"]
+            for slot in dated_slots[lo:hi]
+            if slot.get("current_bookings", 0) < slot.get("max_capacity", 1)
+        ]
 
     def update_slot(self, slot_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -187,17 +360,22 @@ class SlotService:
 
             updates["updated_at"] = get_now_ist().isoformat()
             response = self.client.table("slots").update(updates).eq("id", slot_id).execute()
+            self.invalidate_slot(slot_id)
             
             if not response.data:
                 raise AgentError("Failed to update slot", "SlotService")
             return self._map_to_frontend(response.data[0])
         except Exception as e:
+            # Moving a slot onto an occupied datetime trips the unique index on slot_datetime
+            if getattr(e, "code", None) == _UNIQUE_VIOLATION or "duplicate key" in str(e):
+                raise DuplicateSlotError()
             logger.error(f"Error updating slot: {e}")
             raise AgentError(f"Failed to update slot: {str(e)}", "SlotService")
 
     def delete_slot(self, slot_id: str) -> bool:
         try:
             self.client.table("slots").delete().eq("id", slot_id).execute()
+            self.invalidate_slot(slot_id)
             return True
         except Exception as e:
             logger.error(f"Error deleting slot: {e}")
@@ -216,6 +394,7 @@ class SlotService:
             
             status = "full" if is_booked else "active"
             response = self.client.table("slots").update({"status": status}).eq("id", slot_id).execute()
+            self.invalidate_slot(slot_id)
             return bool(response.data)
         except Exception as e:
             logger.error(f"Error updating slot status: {e}")
@@ -238,28 +417,47 @@ class SlotService:
         created_slots = []
         errors = []
         
-        current_time = datetime.combine(date, time(hour=start_hour, minute=start_minute))
+        start_boundary = datetime.combine(date, time(hour=start_hour, minute=start_minute))
         end_time_boundary = datetime.combine(date, time(hour=end_hour, minute=end_minute))
-        
-        while current_time < end_time_boundary:
-            next_slot_time = current_time + timedelta(minutes=interval_minutes)
-            if next_slot_time > end_time_boundary:
-                break
-                
-            try:
-                slot = self.create_slot(
-                    start_time=current_time,
-                    end_time=next_slot_time,
-                    max_bookings=max_capacity,
-                    notes=notes,
-                    duration_minutes=interval_minutes
-                )
-                created_slots.append(slot)
-            except Exception as e:
-                errors.append(f"Failed to create slot at {current_time.isoformat()}: {str(e)}")
-            
-            current_time = next_slot_time
-            
+        interval_delta = timedelta(minutes=interval_minutes)
+
+        # Number of whole intervals that fit in the window, computed once up front.
+        # Localize the first start once; the rest are fixed strides from it (IST has no DST).
+        slot_count = max(0, (end_time_boundary - start_boundary) // interval_delta)
+        start_ist = to_ist(start_boundary)
+        slot_times = [start_ist + i * interval_delta for i in range(slot_count)]
+
+        if not slot_times:
+            return created_slots, errors
+
+        now_iso = get_now_ist().isoformat()
+        rows = [
+            self._build_slot_row(current_time, interval_minutes, max_capacity, notes, now_iso)
+            for current_time in slot_times
+        ]
+
+        # One INSERT ... ON CONFLICT (slot_datetime) DO NOTHING for the whole day; only
+        # newly inserted rows come back, so anything missing from the result already existed.
+        try:
+            response = self.client.table("slots").upsert(
+                rows, on_conflict="slot_datetime", ignore_duplicates=True
+            ).execute()
+        except Exception as e:
+            logger.error(f"Error creating day slots: {e}")
+            errors.extend(
+                f"Failed to create slot at {current_time.isoformat()}: {str(e)}" for current_time in slot_times
+            )
+            return created_slots, errors
+
+        self.invalidate_available_slots()
+        inserted = {row["id"]: row for row in (response.data or [])}
+        for current_time, row in zip(slot_times, rows):
+            created = inserted.get(row["id"])
+            if created:
+                created_slots.append(self._map_to_frontend(created))
+            else:
+                errors.append(f"Failed to create slot at {current_time.isoformat()}: {DuplicateSlotError().message}")
+
         return created_slots, errors
 
 
@@ -287,8 +485,32 @@ class SlotService:
                 updates["status"] = "full"
             
             response = self.client.table("slots").update(updates).eq("id", slot_id).execute()
+            self.invalidate_slot(slot_id)
             
             return bool(response.data)
         except Exception as e:
             logger.error(f"Error incrementing booking count: {e}")
             return False
+
+    def decrement_booking_count(self, slot_id: str) -> bool:
+        """Give back one seat on the slot (e.g. its booker was deleted); a full slot reopens."""
+        try:
+            response = self.client.table("slots").select("*").eq("id", slot_id).execute()
+            if not response.data:
+                return False
+
+            slot_db = response.data[0]
+            updates = {
+                "booked_count": max((slot_db.get("booked_count") or 0) - 1, 0),
+                "updated_at": get_now_ist().isoformat()
+            }
+            if slot_db.get("status") == "full":
+                updates["status"] = "active"
+
+            response = self.client.table("slots").update(updates).eq("id", slot_id).execute()
+            self.invalidate_slot(slot_id)
+
+            return bool(response.data)
+        except Exception as e:
+            logger.error(f"Error decrementing booking count: {e}")
+            return False
@@ -5,8 +5,11 @@ Handles enrolled user management operations with Supabase.
 """
 
 from typing import Optional, Dict, Any, List
+import threading
 import uuid
 
+from cachetools import TTLCache
+
 from app.config import Config
 from app.db.supabase import get_supabase
 from app.utils.logger import get_logger
@@ -15,6 +18,16 @@ from app.utils.datetime_utils import get_now_ist
 
 logger = get_logger(__name__)
 
+# Student endpoints resolve their enrolled_users row by email on every call, for profile
+# fields only (name/phone fallbacks, legacy id). Never used for authorization, which reads
+# the users row fresh. Other workers' writes cannot clear it, so the TTL is kept short;
+# admin write paths pass use_cache=False.
+_USER_BY_EMAIL_CACHE_TTL = 5  # seconds
+_USER_BY_EMAIL_CACHE_SIZE = 10_000
+
+# PostgREST error code for "function not found" (docs/migration_cascade_delete_user.sql not applied)
+_RPC_NOT_FOUND = "PGRST202"
+
 
 class UserService:
     """Service for managing enrolled users using Supabase"""
@@ -22,6 +35,21 @@ class UserService:
     def __init__(self, config: Config):
         self.config = config
         self.client = get_supabase()
+        self._by_email_cache: TTLCache = TTLCache(
+            maxsize=_USER_BY_EMAIL_CACHE_SIZE, ttl=_USER_BY_EMAIL_CACHE_TTL
+        )
+        self._cache_lock = threading.Lock()
+        self._cascade_rpc_available = True
+
+    def invalidate_user(self, email: Optional[str] = None, user_id: Optional[str] = None) -> None:
+        """Drop cached lookups for an email and/or any cached entry holding user_id."""
+        with self._cache_lock:
+            if email:
+                self._by_email_cache.pop(email, None)
+            if user_id:
+                stale = [k for k, v in self._by_email_cache.items() if v.get("id") == user_id]
+                for k in stale:
+                    self._by_email_cache.pop(k, None)
 
     def create_user(
         self,
@@ -43,15 +71,54 @@ class UserService:
                 "updated_at": now_iso,
             }
             response = self.client.table("enrolled_users").insert(user_data).execute()
+            self.invalidate_user(email=email)
             return response.data[0] if response.data else user_data
         except Exception as e:
             logger.error(f"Error creating user: {e}")
             raise AgentError(f"Failed to create user: {str(e)}", "UserService")
 
-    def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+    def create_users_bulk(self, users: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many enrolled users (name, email, phone, notes) in a single insert."""
+        if not users:
+            return []
+        try:
+            now_iso = get_now_ist().isoformat()
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "name": u["name"],
+                    "email": u["email"],
+                    "phone": u.get("phone"),
+                    "notes": u.get("notes"),
+                    "status": "enrolled",
+                    "created_at": now_iso,
+                    "updated_at": now_iso,
+                }
+                for u in users
+            ]
+            response = self.client.table("enrolled_users").insert(rows).execute()
+            for row in rows:
+                self.invalidate_user(email=row["email"])
+            return response.data or rows
+        except Exception as e:
+            logger.error(f"Error creating users: {e}")
+            raise AgentError(f"Failed to create users: {str(e)}", "UserService")
+
+    def get_user_by_email(self, email: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        if use_cache:
+            with self._cache_lock:
+                cached = self._by_email_cache.get(email)
+            if cached is not None:
+                return dict(cached)
         try:
             response = self.client.table("enrolled_users").select("*").eq("email", email).execute()
-            return response.data[0] if response.data else None
+            if not response.data:
+                # Misses are not cached so a just-enrolled user is visible on other workers
+                return None
+            user = response.data[0]
+            with self._cache_lock:
+                self._by_email_cache[email] = user
+            return dict(user)
         except Exception as e:
             logger.error(f"Error fetching user by email: {e}")
             return None
@@ -100,6 +167,7 @@ class UserService:
             update_data['updated_at'] = get_now_ist().isoformat()
             
             response = self.client.table("enrolled_users").update(update_data).eq("id", user_id).execute()
+            self.invalidate_user(user_id=user_id)
             
             if not response.data:
                 raise AgentError("Failed to update user", "UserService")
@@ -108,9 +176,36 @@ class UserService:
             logger.error(f"Error updating user: {e}")
             raise AgentError(f"Failed to update user: {str(e)}", "UserService")
 
+    def delete_user_cascade(self, user_id: str, email: Optional[str]) -> Optional[List[str]]:
+        """
+        Delete the user with their transcripts, evaluations and slot assignments in one
+        transaction (cascade_delete_user() in Postgres), releasing the seat on any slot the
+        student selected. email resolves the student's auth id, which selected assignments
+        and bookings are keyed by; the auth account itself is left for AuthService.
+
+        Returns the ids of slots whose seat was released, or None without touching anything
+        when the function is not installed, so the caller can fall back to the individual deletes.
+        """
+        if not self._cascade_rpc_available:
+            return None
+        try:
+            response = self.client.rpc(
+                "cascade_delete_user", {"p_user_id": user_id, "p_email": email}
+            ).execute()
+            self.invalidate_user(email=email, user_id=user_id)
+            return list(response.data or [])
+        except Exception as e:
+            if getattr(e, "code", None) == _RPC_NOT_FOUND:
+                logger.warning("[UserService] cascade_delete_user() not installed; using separate deletes")
+                self._cascade_rpc_available = False
+                return None
+            logger.error(f"Error deleting user: {e}")
+            raise AgentError(f"Failed to delete user: {str(e)}", "UserService")
+
     def delete_user(self, user_id: str) -> bool:
         try:
             self.client.table("enrolled_users").delete().eq("id", user_id).execute()
+            self.invalidate_user(user_id=user_id)
             return True
         except Exception as e:
             logger.error(f"Error deleting user: {e}")
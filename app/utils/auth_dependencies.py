@@ -8,7 +8,7 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.services.auth_service import AuthService
-from app.config import Config, get_config
+from app.config import Config
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,9 +17,9 @@ security = HTTPBearer()
 
 
 def get_auth_service() -> AuthService:
-    """Get auth service instance"""
-    config = get_config()
-    return AuthService(config)
+    """Get the shared auth service instance (built once in app.services.container)"""
+    from app.services.container import auth_service  # local import: container builds every service
+    return auth_service
 
 
 async def get_current_user(
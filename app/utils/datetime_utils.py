@@ -1,4 +1,5 @@
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 import re
 from fastapi import HTTPException, status
 
@@ -21,6 +22,16 @@ def to_ist(dt: datetime) -> datetime:
         return dt.replace(tzinfo=IST)
     return dt.astimezone(IST)
 
+@lru_cache(maxsize=4096)
+def parse_iso_to_ist(dt_str: str) -> datetime:
+    """
+    Parse a strict ISO-8601 string (trailing 'Z' allowed) and return it in IST.
+    Naive values are taken as IST. Raises ValueError on malformed input.
+    Memoized: slot datetimes are re-parsed on every enrollment/slot request.
+    """
+    return to_ist(datetime.fromisoformat(dt_str.replace('Z', '+00:00')))
+
+@lru_cache(maxsize=8192)
 def parse_datetime_safe(dt_str: str) -> datetime:
     """
     Parse a datetime string that could be in UTC or IST format.
@@ -29,7 +40,8 @@ def parse_datetime_safe(dt_str: str) -> datetime:
     - IST format: '2026-01-28T12:24:00+05:30'
     - Naive format: '2026-01-28T12:24:00' (assumed IST)
     
-    Always returns IST-aware datetime.
+    Always returns IST-aware datetime. Results are memoized per input string
+    (datetimes are immutable); the same slot/booking timestamps recur across requests.
     
     IMPORTANT: Supabase typically stores timestamps in UTC and may return them
     in UTC format even if we stored them with IST timezone. This function
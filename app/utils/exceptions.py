@@ -88,6 +88,20 @@ class AgentError(ApplicationError):
         super().__init__(message, error_code, 503)
 
 
+class DuplicateSlotError(ApplicationError):
+    """Raised when an interview slot already exists at the requested date and time."""
+
+    def __init__(self, message: str = "A slot already exists at this date and time."):
+        super().__init__(message, "SLOT_EXISTS", 409)
+
+
+class SlotUnavailableError(ApplicationError):
+    """Raised when a slot can no longer be booked (full, cancelled or removed)."""
+
+    def __init__(self, message: str = "Slot is not available"):
+        super().__init__(message, "SLOT_UNAVAILABLE", 400)
+
+
 class SupabaseUnavailableError(ApplicationError):
     """Raised when Supabase/Cloudflare is unreachable (e.g. 525 SSL handshake failed)."""
 
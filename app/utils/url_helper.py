@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 from fastapi import Request
 from urllib.parse import urlparse
@@ -7,6 +8,14 @@ from app.utils.logger import get_logger
 logger = get_logger(__name__)
 config = get_config()
 
+
+@lru_cache(maxsize=256)
+def _base_url_from_header(header_value: str) -> str:
+    """scheme://netloc of an Origin/Referer value (memoized; clients send a handful of origins)."""
+    parsed = urlparse(header_value)
+    return f"{parsed.scheme}://{parsed.netloc}".rstrip('/')
+
+
 def get_frontend_url(request: Optional[Request] = None) -> str:
     """
     Get frontend URL from request origin/referer, fallback to config.
@@ -21,23 +30,21 @@ def get_frontend_url(request: Optional[Request] = None) -> str:
         # Try Origin header first (more reliable for CORS requests)
         origin = request.headers.get('Origin')
         if origin:
-            parsed = urlparse(origin)
-            base_url = f"{parsed.scheme}://{parsed.netloc}".rstrip('/')
+            base_url = _base_url_from_header(origin)
             if base_url:
-                logger.debug(f"[API] Using frontend URL from Origin header: {base_url}")
+                logger.debug("[API] Using frontend URL from Origin header: %s", base_url)
                 return base_url
         
         # Fallback to Referer header
         referer = request.headers.get('Referer')
         if referer:
-            parsed = urlparse(referer)
-            base_url = f"{parsed.scheme}://{parsed.netloc}".rstrip('/')
+            base_url = _base_url_from_header(referer)
             if base_url:
-                logger.debug(f"[API] Using frontend URL from Referer header: {base_url}")
+                logger.debug("[API] Using frontend URL from Referer header: %s", base_url)
                 return base_url
     
     # Final fallback to config
     fallback_url = config.server.frontend_url.rstrip('/') if config.server.frontend_url else ''
     if fallback_url:
-        logger.debug(f"[API] Using frontend URL from config: {fallback_url}")
+        logger.debug("[API] Using frontend URL from config: %s", fallback_url)
     return fallback_url
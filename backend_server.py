@@ -20,7 +20,9 @@ if __name__ == "__main__":
         "app.main:app",
         host=host,
         port=port,
-        reload=True,
+        # uvicorn[standard] ships uvloop + httptools; the "auto" loop/http settings pick them up
+        reload=config.server.reload,
+        workers=None if config.server.reload else config.server.workers,
         log_level="info",
     )
 
@@ -0,0 +1,58 @@
+-- Migration: cascade_delete_user() - delete an enrolled user and their interview data in one transaction
+-- Called by UserService.delete_user_cascade via supabase.rpc(...). Without this function
+-- the API falls back to deleting transcripts, evaluations and the user separately.
+-- The student login (users row) is removed by the API afterwards via AuthService.
+-- Run this in Supabase SQL Editor
+
+-- Earlier version of this function (enrolled id only)
+DROP FUNCTION IF EXISTS cascade_delete_user(UUID);
+
+CREATE OR REPLACE FUNCTION cascade_delete_user(
+    p_user_id UUID,   -- enrolled_users.id
+    p_email TEXT      -- the student's email; their auth users.id keys selected assignments and bookings
+) RETURNS UUID[]      -- ids of slots whose seat was released
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_auth_id UUID;
+    v_released UUID[];
+BEGIN
+    SELECT id INTO v_auth_id FROM users WHERE email = p_email AND role = 'student';
+
+    -- 1. Transcripts and evaluations of the user's interviews
+    DELETE FROM transcripts
+    WHERE booking_token IN (
+        SELECT token FROM interview_bookings WHERE user_id IN (p_user_id, v_auth_id)
+    );
+
+    DELETE FROM evaluations
+    WHERE booking_token IN (
+        SELECT token FROM interview_bookings WHERE user_id IN (p_user_id, v_auth_id)
+    );
+
+    -- 2. Give back the seat on any slot the student had selected; a full slot reopens
+    WITH released AS (
+        UPDATE slots
+        SET booked_count = GREATEST(COALESCE(booked_count, 0) - 1, 0),
+            status = CASE WHEN status = 'full' THEN 'active' ELSE status END,
+            updated_at = NOW()
+        WHERE id IN (
+            SELECT slot_id FROM assignments
+            WHERE user_id IN (p_user_id, v_auth_id) AND status = 'selected'
+        )
+        RETURNING id
+    )
+    SELECT COALESCE(array_agg(id), '{}') INTO v_released FROM released;
+
+    DELETE FROM assignments WHERE user_id IN (p_user_id, v_auth_id);
+
+    -- 3. The enrolled user itself
+    DELETE FROM enrolled_users WHERE id = p_user_id;
+
+    RETURN v_released;
+END;
+$$;
+
+-- Note: if your tables are named user_slot_assignments / interview_slots / interview_transcripts /
+-- interview_evaluations instead of assignments / slots / transcripts / evaluations, adjust the
+-- table names above to match.
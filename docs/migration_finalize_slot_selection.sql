@@ -0,0 +1,67 @@
+-- Migration: finalize_slot_selection() - book a slot and apply the post-booking updates of
+-- select_slot in one transaction
+-- Called by AssignmentService.finalize_slot_selection via supabase.rpc(...). Without this function
+-- the API falls back to inserting the booking and issuing the updates separately.
+-- Run this in Supabase SQL Editor
+
+-- Earlier version of this function (no booking insert / capacity check)
+DROP FUNCTION IF EXISTS finalize_slot_selection(UUID, UUID, UUID);
+
+CREATE OR REPLACE FUNCTION finalize_slot_selection(
+    p_user_id UUID,          -- auth users.id (assignments and bookings are keyed by it)
+    p_email TEXT,            -- student email (enrolled_users has its own id)
+    p_assignment_id UUID,
+    p_slot_id UUID,
+    p_booking JSONB          -- interview_bookings row built by BookingService.build_booking
+) RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_slot slots%ROWTYPE;
+BEGIN
+    -- 1. Lock the slot and re-check it, so concurrent selections cannot overbook it
+    SELECT * INTO v_slot FROM slots WHERE id = p_slot_id FOR UPDATE;
+    IF NOT FOUND OR v_slot.status <> 'active' THEN
+        RAISE EXCEPTION 'Slot is not available';
+    END IF;
+    IF COALESCE(v_slot.booked_count, 0) >= v_slot.capacity THEN
+        RAISE EXCEPTION 'Slot is full';
+    END IF;
+
+    -- 2. The booking itself
+    INSERT INTO interview_bookings (
+        id, token, name, email, phone, scheduled_at, application_text, application_url, prompt,
+        slot_id, user_id, assignment_id, application_form_id, status, created_at
+    )
+    SELECT
+        id, token, name, email, phone, scheduled_at, application_text, application_url, prompt,
+        slot_id, user_id, assignment_id, application_form_id, status, created_at
+    FROM jsonb_populate_record(NULL::interview_bookings, p_booking);
+
+    -- 3. Mark the chosen assignment as selected
+    UPDATE assignments
+    SET status = 'selected', selected_at = NOW()
+    WHERE user_id = p_user_id AND id = p_assignment_id;
+
+    -- 4. Cancel the user's other open assignments
+    UPDATE assignments
+    SET status = 'cancelled'
+    WHERE user_id = p_user_id AND status = 'assigned' AND id <> p_assignment_id;
+
+    -- 5. Count the booking; the slot becomes 'full' once it reaches capacity
+    UPDATE slots
+    SET booked_count = COALESCE(booked_count, 0) + 1,
+        status = CASE WHEN COALESCE(booked_count, 0) + 1 >= capacity THEN 'full' ELSE status END,
+        updated_at = NOW()
+    WHERE id = p_slot_id;
+
+    -- 6. Move the student on to 'slot_selected'; students without an enrolled_users row
+    -- (e.g. self-registered) have nothing to update
+    UPDATE enrolled_users
+    SET interview_status = 'slot_selected', updated_at = NOW()
+    WHERE email = p_email;
+END;
+$$;
+
+-- Note: if your tables are named user_slot_assignments / interview_slots instead of
+-- assignments / slots, adjust the table names above to match.
@@ -0,0 +1,17 @@
+-- Migration: Enforce one slot per date/time with a unique index on slot_datetime
+-- SlotService.create_slot inserts with ON CONFLICT (slot_datetime) DO NOTHING and treats an
+-- empty result as "slot already exists" (HTTP 409), so this index is required.
+-- Run this in Supabase SQL Editor
+
+-- Step 1: Check for existing duplicates (must be resolved before the index can be built)
+-- SELECT slot_datetime, COUNT(*) FROM slots GROUP BY slot_datetime HAVING COUNT(*) > 1;
+
+-- Step 2: Create the unique index
+-- Option A: If your table is named "slots" (Supabase public.slots)
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS slots_slot_datetime_uniq ON slots(slot_datetime);
+
+-- Option B: If your table is named "interview_slots", uncomment below and comment Option A:
+-- CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS interview_slots_slot_datetime_uniq ON interview_slots(slot_datetime);
+
+-- Note: CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+-- If your SQL editor wraps statements in a transaction, drop the CONCURRENTLY keyword.